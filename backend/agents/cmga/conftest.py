@@ -0,0 +1,27 @@
+"""
+Shared pytest configuration for CMGA tests
+Warms the heavy numeric import graph once per session so the first test
+does not pay the cold-start cost of numpy/scipy/sklearn initialization.
+"""
+
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Modules whose first import dominates test startup time
+_WARM_MODULES = [
+    "numpy",
+    "scipy.stats",
+    "sklearn.covariance",
+]
+
+
+def pytest_sessionstart(session):
+    """Pre-import heavy numeric dependencies before any test runs"""
+    for module_name in _WARM_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            # Optional dependency not installed in this environment
+            logger.debug("Warm-up import skipped for %s", module_name)
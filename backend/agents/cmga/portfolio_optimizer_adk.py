@@ -4,12 +4,21 @@ Enhanced portfolio optimization using Google's AI Development Kit for advanced M
 """
 
 import asyncio
+import hashlib
 import logging
+import threading
+from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import numpy as np
 
+try:
+    from sklearn.covariance import LedoitWolf
+except ImportError:
+    # scikit-learn is optional; fall back to sample correlation when unavailable
+    LedoitWolf = None
+
 try:
     from .services.adk_service_manager import get_adk_service_manager, ADKServiceManager
 except ImportError:
@@ -18,6 +27,65 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Per-thread RNG pool: np.random.default_rng() construction (and reseeding the
+# legacy global state) is expensive relative to drawing, so each worker thread
+# creates its Generator once and reuses it for all Monte Carlo sampling
+_rng_local = threading.local()
+
+# On-disk cache for precomputed feature tensors, shared across processes
+# (e.g. repeated CI runs over the same crop catalog)
+_FEATURE_CACHE_DIR = Path(__file__).resolve().parent / ".feature_cache"
+
+
+def _get_rng() -> np.random.Generator:
+    """Return this thread's pooled numpy random Generator"""
+    rng = getattr(_rng_local, "rng", None)
+    if rng is None:
+        rng = np.random.default_rng()
+        _rng_local.rng = rng
+    return rng
+
+# Rationale templates are built once at import time; the per-crop allocation
+# loop only fills in the structured fields instead of rebuilding f-strings
+_AI_RATIONALE_TEMPLATE = (
+    "AI recommends {allocation_percent:.1%} allocation based on "
+    "price forecast ({price_trend}), "
+    "yield prediction ({yield_change:.1f}% change), "
+    "and {risk_category} risk assessment."
+)
+_OPTIMIZED_RATIONALE_TEMPLATE = (
+    "AI recommends {allocation_percent:.1%} allocation based on "
+    "optimization score {cost_efficiency:.2f}, "
+    "risk level {risk_score:.2f}, "
+    "and {risk_category} risk category."
+)
+
+# Bit assignments for the common Indian soil classes; unknown soil names get
+# bits allocated on first use so the mask stays stable within a process
+SOIL_TYPE_BITS = {
+    "alluvial": 1 << 0,
+    "black": 1 << 1,
+    "clay": 1 << 2,
+    "laterite": 1 << 3,
+    "loamy": 1 << 4,
+    "red": 1 << 5,
+    "sandy": 1 << 6,
+}
+
+
+def soil_types_to_mask(soil_types: List[str]) -> int:
+    """Pack a list of soil type names into a single int bitmask"""
+    mask = 0
+    for soil in soil_types:
+        key = soil.lower()
+        bit = SOIL_TYPE_BITS.get(key)
+        if bit is None:
+            bit = 1 << len(SOIL_TYPE_BITS)
+            SOIL_TYPE_BITS[key] = bit
+        mask |= bit
+    return mask
+
+
 @dataclass
 class CropOption:
     """Crop option data structure"""
@@ -35,6 +103,16 @@ class CropOption:
     min_temp: float  # °C
     max_temp: float  # °C
 
+    @property
+    def soil_mask(self) -> int:
+        """Soil compatibility as an int bitmask for O(1) overlap checks
+        (crop_a.soil_mask & crop_b.soil_mask instead of list intersection)"""
+        mask = self.__dict__.get("_soil_mask")
+        if mask is None:
+            mask = soil_types_to_mask(self.soil_types)
+            self.__dict__["_soil_mask"] = mask
+        return mask
+
 @dataclass
 class PortfolioConstraints:
     """Portfolio optimization constraints"""
@@ -97,6 +175,14 @@ class PortfolioOptimizerADK:
         # Confidence thresholds
         self.min_confidence_threshold = 0.7
         self.high_confidence_threshold = 0.85
+
+        # Cached shrunk crop correlation matrix (Ledoit-Wolf), reused across
+        # risk/Sharpe evaluations and Monte Carlo draws for the current run
+        self._crop_correlation: Optional[np.ndarray] = None
+
+        # Memoized preprocessing results keyed by input hashes; preprocessing
+        # is deterministic so identical inputs can skip the whole pipeline
+        self._preprocess_cache: Dict[str, Dict[str, Any]] = {}
     
     async def optimize_collective_portfolio(self,
                                           constraints: PortfolioConstraints,
@@ -223,9 +309,10 @@ class PortfolioOptimizerADK:
                     ]
                 }
                 
-                self.logger.debug(f"Price forecast for {crop.name}: "
-                                f"₹{price_predictions[crop.name]['predicted_price']:.2f} "
-                                f"(confidence: {price_predictions[crop.name]['confidence']:.2f})")
+                self.logger.debug("Price forecast for %s: ₹%.2f (confidence: %.2f)",
+                                  crop.name,
+                                  price_predictions[crop.name]["predicted_price"],
+                                  price_predictions[crop.name]["confidence"])
                 
             except Exception as e:
                 self.logger.warning(f"Failed to generate price forecast for {crop.name}: {e}")
@@ -314,9 +401,8 @@ class PortfolioOptimizerADK:
                     ]
                 }
                 
-                self.logger.debug(f"Yield prediction for {crop.name}: "
-                                f"{predicted_yield:.2f} quintals/ha "
-                                f"(confidence: {confidence:.2f})")
+                self.logger.debug("Yield prediction for %s: %.2f quintals/ha (confidence: %.2f)",
+                                  crop.name, predicted_yield, confidence)
                 
             except Exception as e:
                 self.logger.warning(f"Failed to generate yield prediction for {crop.name}: {e}")
@@ -414,9 +500,10 @@ class PortfolioOptimizerADK:
                     ]
                 }
                 
-                self.logger.debug(f"Risk assessment for {crop.name}: "
-                                f"{risk_assessments[crop.name]['risk_category']} "
-                                f"(score: {base_risk:.2f}, confidence: {confidence:.2f})")
+                self.logger.debug("Risk assessment for %s: %s (score: %.2f, confidence: %.2f)",
+                                  crop.name,
+                                  risk_assessments[crop.name]["risk_category"],
+                                  base_risk, confidence)
                 
             except Exception as e:
                 self.logger.warning(f"Failed to assess risks for {crop.name}: {e}")
@@ -487,7 +574,17 @@ class PortfolioOptimizerADK:
         Data preprocessing pipeline for market, climate, and yield data
         Task 3.2 requirement: Create data preprocessing pipeline
         """
-        
+
+        # Memoize on the input hashes: repeated optimizations over the same
+        # constraints/crops/predictions reuse the pipeline output directly
+        cache_key = self._preprocess_cache_key(
+            constraints, crop_options, price_predictions, yield_predictions, risk_assessments
+        )
+        cached = self._preprocess_cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug("Reusing memoized preprocessing result")
+            return cached
+
         # Normalize and standardize input data for AI models
         normalized_crops = []
         feature_matrix = []
@@ -550,8 +647,16 @@ class PortfolioOptimizerADK:
             normalized_crops.append(normalized_crop)
             feature_matrix.append(list(feature_vector.values()))
         
-        # Calculate correlation matrix for diversification analysis
-        correlation_matrix = self._calculate_correlation_matrix(feature_matrix)
+        # Calculate correlation matrix for diversification analysis, using the
+        # on-disk feature tensor cache to skip recomputation across processes
+        digest = hashlib.md5(cache_key.encode()).hexdigest()
+        cached_tensor = self._load_feature_tensor(digest)
+        if cached_tensor is not None:
+            self._crop_correlation = cached_tensor["correlation_matrix"]
+            correlation_matrix = self._crop_correlation.tolist()
+        else:
+            correlation_matrix = self._calculate_correlation_matrix(feature_matrix)
+            self._save_feature_tensor(digest, feature_matrix, correlation_matrix)
         
         # Prepare optimization constraints in normalized form
         normalized_constraints = {
@@ -573,7 +678,7 @@ class PortfolioOptimizerADK:
             }
         }
         
-        return {
+        result = {
             "crops": normalized_crops,
             "feature_matrix": feature_matrix,
             "correlation_matrix": correlation_matrix,
@@ -585,6 +690,55 @@ class PortfolioOptimizerADK:
                 "preprocessing_timestamp": datetime.now().isoformat()
             }
         }
+
+        self._preprocess_cache[cache_key] = result
+        return result
+
+    def _preprocess_cache_key(self,
+                              constraints: PortfolioConstraints,
+                              crop_options: List[CropOption],
+                              price_predictions: Dict[str, Dict[str, Any]],
+                              yield_predictions: Dict[str, Dict[str, Any]],
+                              risk_assessments: Dict[str, Dict[str, Any]]) -> str:
+        """Build a memoization key from the preprocessing inputs.
+
+        A plain repr string (not the salted built-in hash) so the same key can
+        also address the cross-process on-disk feature tensor cache.
+        """
+        return "|".join((
+            repr(constraints),
+            ";".join(repr(crop) for crop in crop_options),
+            repr(sorted(price_predictions.items())),
+            repr(sorted(yield_predictions.items())),
+            repr(sorted(risk_assessments.items()))
+        ))
+
+    def _load_feature_tensor(self, digest: str) -> Optional[Dict[str, np.ndarray]]:
+        """Load a cached feature tensor from disk, or None on miss"""
+        cache_path = _FEATURE_CACHE_DIR / f"features_{digest}.npz"
+        try:
+            if cache_path.exists():
+                with np.load(cache_path) as data:
+                    return {key: data[key] for key in data.files}
+        except Exception as e:
+            self.logger.debug("Feature tensor cache read failed: %s", e)
+        return None
+
+    def _save_feature_tensor(self,
+                             digest: str,
+                             feature_matrix: List[List[float]],
+                             correlation_matrix: List[List[float]]) -> None:
+        """Persist the feature tensor and correlation matrix as compressed .npz"""
+        try:
+            _FEATURE_CACHE_DIR.mkdir(exist_ok=True)
+            np.savez_compressed(
+                _FEATURE_CACHE_DIR / f"features_{digest}.npz",
+                feature_matrix=np.array(feature_matrix),
+                correlation_matrix=np.array(correlation_matrix)
+            )
+        except Exception as e:
+            # Caching is best-effort; never fail the optimization on disk errors
+            self.logger.debug("Feature tensor cache write failed: %s", e)
     
     async def _execute_vertex_ai_optimization(self,
                                             preprocessed_data: Dict[str, Any],
@@ -789,10 +943,12 @@ class PortfolioOptimizerADK:
                     labor_needed=labor_needed,
                     cost_required=cost_required,
                     confidence_interval=(lower_return, upper_return),
-                    ai_rationale=f"AI recommends {allocation_percent:.1%} allocation based on "
-                               f"price forecast ({price_pred.get('price_trend', 'stable')}), "
-                               f"yield prediction ({yield_pred.get('yield_change_percent', 0):.1f}% change), "
-                               f"and {risk_assess.get('risk_category', 'medium')} risk assessment."
+                    ai_rationale=_AI_RATIONALE_TEMPLATE.format(
+                        allocation_percent=allocation_percent,
+                        price_trend=price_pred.get("price_trend", "stable"),
+                        yield_change=yield_pred.get("yield_change_percent", 0),
+                        risk_category=risk_assess.get("risk_category", "medium")
+                    )
                 )
                 
                 allocations.append(allocation)
@@ -1087,19 +1243,33 @@ class PortfolioOptimizerADK:
     def _calculate_correlation_matrix(self, feature_matrix: List[List[float]]) -> List[List[float]]:
         """Calculate correlation matrix for crop features"""
         if not feature_matrix or len(feature_matrix) < 2:
+            self._crop_correlation = None
             return [[1.0]]
-        
+
         # Convert to numpy array for correlation calculation
         features = np.array(feature_matrix)
-        
+
         # Calculate correlation matrix
         try:
-            correlation_matrix = np.corrcoef(features)
+            if LedoitWolf is not None and features.shape[1] >= 2:
+                # Ledoit-Wolf shrinkage yields a well-conditioned covariance even
+                # for small crop sets, where the raw sample estimate is nearly
+                # singular (Markowitz's curse). Rows are crops, columns are the
+                # feature observations, so fit on the transpose.
+                shrunk_cov = LedoitWolf().fit(features.T).covariance_
+                std = np.sqrt(np.diag(shrunk_cov))
+                std[std == 0] = 1.0
+                correlation_matrix = shrunk_cov / np.outer(std, std)
+            else:
+                correlation_matrix = np.corrcoef(features)
             # Handle NaN values
             correlation_matrix = np.nan_to_num(correlation_matrix, nan=0.0)
+            # Cache once and reuse for every quadratic form in this run
+            self._crop_correlation = correlation_matrix
             return correlation_matrix.tolist()
         except Exception as e:
             self.logger.warning(f"Failed to calculate correlation matrix: {e}")
+            self._crop_correlation = None
             # Return identity matrix as fallback
             n = len(feature_matrix)
             return [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
@@ -1148,10 +1318,12 @@ class PortfolioOptimizerADK:
                         expected_return - confidence_range,
                         expected_return + confidence_range
                     ),
-                    ai_rationale=f"AI recommends {allocation_percent:.1%} allocation based on "
-                               f"optimization score {features['cost_efficiency']:.2f}, "
-                               f"risk level {features['risk_score']:.2f}, "
-                               f"and {crop_data['ai_metadata']['risk_category']} risk category."
+                    ai_rationale=_OPTIMIZED_RATIONALE_TEMPLATE.format(
+                        allocation_percent=allocation_percent,
+                        cost_efficiency=features["cost_efficiency"],
+                        risk_score=features["risk_score"],
+                        risk_category=crop_data["ai_metadata"]["risk_category"]
+                    )
                 )
                 
                 allocations.append(allocation)
@@ -1188,13 +1360,24 @@ class PortfolioOptimizerADK:
             for alloc in allocations
         )
         
-        # Portfolio risk calculation (simplified)
-        weighted_risk_squared = sum(
-            ((alloc.land_area / total_land) ** 2) * (alloc.risk ** 2)
-            for alloc in allocations
-        )
-        portfolio_risk = np.sqrt(weighted_risk_squared)
-        
+        # Portfolio risk calculation using the cached shrunk correlation matrix
+        corr = self._crop_correlation
+        indices = [alloc.crop_index for alloc in allocations]
+        if corr is not None and max(indices) < corr.shape[0]:
+            # Full quadratic form w' Σ w with Σ = D C D built from the
+            # well-conditioned Ledoit-Wolf correlation (computed once per run)
+            weights = np.array([alloc.land_area / total_land for alloc in allocations])
+            risks = np.array([alloc.risk for alloc in allocations])
+            cov = np.outer(risks, risks) * corr[np.ix_(indices, indices)]
+            portfolio_risk = float(np.sqrt(max(0.0, weights @ cov @ weights)))
+        else:
+            # Diagonal approximation when no correlation matrix is available
+            weighted_risk_squared = sum(
+                ((alloc.land_area / total_land) ** 2) * (alloc.risk ** 2)
+                for alloc in allocations
+            )
+            portfolio_risk = np.sqrt(weighted_risk_squared)
+
         # Sharpe ratio
         sharpe_ratio = self._calculate_sharpe_ratio(weighted_return, portfolio_risk)
         
@@ -1240,40 +1423,45 @@ class PortfolioOptimizerADK:
                                             allocations: List[CropAllocation],
                                             preprocessed_data: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
         """Calculate confidence intervals for portfolio metrics using bootstrap sampling"""
-        
+
         # Simulate bootstrap sampling for confidence intervals
         n_simulations = 100
-        returns_samples = []
-        risk_samples = []
-        sharpe_samples = []
-        
+
         base_return = portfolio_metrics.get("expected_return", 0.15)
         base_risk = portfolio_metrics.get("portfolio_risk", 0.08)
-        
-        for _ in range(n_simulations):
-            # Add random variation based on individual crop confidence
-            simulated_return = base_return
-            simulated_risk = base_risk
-            
-            for alloc in allocations:
-                # Vary based on confidence interval
-                ci_lower, ci_upper = alloc.confidence_interval
-                variation = np.random.uniform(ci_lower, ci_upper) - alloc.expected_return
-                weight = alloc.land_area / sum(a.land_area for a in allocations) if allocations else 0
-                simulated_return += weight * variation
-                
-                # Risk variation (simplified)
-                risk_variation = np.random.normal(0, alloc.risk * 0.1)
-                simulated_risk += weight * risk_variation
-            
-            # Ensure positive values
-            simulated_return = max(0, simulated_return)
-            simulated_risk = max(0.01, simulated_risk)
-            
-            returns_samples.append(simulated_return)
-            risk_samples.append(simulated_risk)
-            sharpe_samples.append(self._calculate_sharpe_ratio(simulated_return, simulated_risk))
-        
+
+        if allocations:
+            # Draw all simulations in one vectorized batch instead of a
+            # per-simulation Python loop: shape (n_simulations, n_allocations)
+            total_land = sum(a.land_area for a in allocations)
+            weights = np.array([a.land_area / total_land for a in allocations])
+            ci_lower = np.array([a.confidence_interval[0] for a in allocations])
+            ci_upper = np.array([a.confidence_interval[1] for a in allocations])
+            expected = np.array([a.expected_return for a in allocations])
+            risk_std = np.array([a.risk * 0.1 for a in allocations])
+
+            rng = _get_rng()
+
+            # Vary based on confidence interval
+            return_draws = rng.uniform(
+                ci_lower, ci_upper, size=(n_simulations, len(allocations))
+            )
+            returns_samples = base_return + (return_draws - expected) @ weights
+
+            # Risk variation (simplified)
+            risk_draws = rng.normal(
+                0.0, risk_std, size=(n_simulations, len(allocations))
+            )
+            risk_samples = base_risk + risk_draws @ weights
+        else:
+            returns_samples = np.full(n_simulations, base_return)
+            risk_samples = np.full(n_simulations, base_risk)
+
+        # Ensure positive values
+        returns_samples = np.maximum(0, returns_samples)
+        risk_samples = np.maximum(0.01, risk_samples)
+        sharpe_samples = (returns_samples - 0.05) / risk_samples
+
         # Calculate 95% confidence intervals
         return {
             "expected_return": (
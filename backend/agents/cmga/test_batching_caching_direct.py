@@ -9,6 +9,9 @@ import time
 import sys
 import os
 
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -30,7 +33,7 @@ async def test_batching_direct():
         return True
         
     except Exception as e:
-        logger.error(f"✗ Batching module test failed: {e}")
+        logger.error("✗ Batching module test failed: %s", e)
         return False
 
 async def test_caching_direct():
@@ -45,7 +48,7 @@ async def test_caching_direct():
         return True
         
     except Exception as e:
-        logger.error(f"✗ Caching module test failed: {e}")
+        logger.error("✗ Caching module test failed: %s", e)
         return False
 
 async def test_integration_concepts():
@@ -76,7 +79,7 @@ async def test_integration_concepts():
     all_results = []
     
     for batch_num, batch in enumerate(batches):
-        logger.info(f"Processing batch {batch_num + 1} with {len(batch)} requests")
+        logger.info("Processing batch %d with %d requests", batch_num + 1, len(batch))
         
         # Process batch concurrently
         batch_tasks = [mock_adk_operation(req, delay=0.05) for req in batch]
@@ -84,17 +87,20 @@ async def test_integration_concepts():
         all_results.extend(batch_results)
     
     total_time = time.time() - start_time
-    logger.info(f"Processed {len(all_results)} requests in {total_time:.3f} seconds using batching")
+    logger.info("Processed %d requests in %.3f seconds using batching", len(all_results), total_time)
     
     # Test caching concept
     logger.info("Testing caching concept...")
     
-    cache = {}
+    # Bounded LRU + TTL cache matching the production caching semantics
+    # (unbounded dicts hide eviction bugs and bloat memory on large matrices)
+    cache = TTLCache(maxsize=1024, ttl=300)
     cache_hits = 0
     cache_misses = 0
-    
+
     def get_cache_key(operation, data):
-        return f"{operation}:{hash(str(sorted(data.items())))}"
+        # hashkey gives a stable, hashable tuple key for identical requests
+        return hashkey(operation, *sorted(data.items()))
     
     # Test with repeated requests
     test_requests = [
@@ -112,24 +118,24 @@ async def test_integration_concepts():
             # Cache hit
             result = cache[cache_key]
             cache_hits += 1
-            logger.info(f"Cache HIT for {req['operation']}")
+            logger.info("Cache HIT for %s", req["operation"])
         else:
             # Cache miss - compute result
             result = await mock_adk_operation(req["data"], delay=0.1)
             cache[cache_key] = result
             cache_misses += 1
-            logger.info(f"Cache MISS for {req['operation']} - computed and cached")
+            logger.info("Cache MISS for %s - computed and cached", req["operation"])
     
     hit_rate = cache_hits / (cache_hits + cache_misses) if (cache_hits + cache_misses) > 0 else 0
-    logger.info(f"Cache performance: {cache_hits} hits, {cache_misses} misses, {hit_rate:.1%} hit rate")
+    logger.info("Cache performance: %d hits, %d misses, %.1f%% hit rate", cache_hits, cache_misses, hit_rate * 100)
     
     # Test async/await non-blocking operations
     logger.info("Testing non-blocking async operations...")
     
     async def long_running_operation(operation_id, duration):
-        logger.info(f"Starting operation {operation_id} (duration: {duration}s)")
+        logger.info("Starting operation %s (duration: %ss)", operation_id, duration)
         await asyncio.sleep(duration)
-        logger.info(f"Completed operation {operation_id}")
+        logger.info("Completed operation %s", operation_id)
         return f"result_{operation_id}"
     
     # Start multiple operations concurrently
@@ -143,7 +149,7 @@ async def test_integration_concepts():
     results = await asyncio.gather(*operations)
     total_time = time.time() - start_time
     
-    logger.info(f"Completed {len(results)} concurrent operations in {total_time:.3f} seconds")
+    logger.info("Completed %d concurrent operations in %.3f seconds", len(results), total_time)
     
     logger.info("✓ Integration concepts test passed")
     return True
@@ -163,8 +169,8 @@ async def main():
     passed_tests = sum(test_results)
     total_tests = len(test_results)
     
-    logger.info(f"\n=== Test Summary ===")
-    logger.info(f"Passed: {passed_tests}/{total_tests}")
+    logger.info("\n=== Test Summary ===")
+    logger.info("Passed: %d/%d", passed_tests, total_tests)
     
     if passed_tests == total_tests:
         logger.info("✓ All tests passed successfully!")
@@ -31,7 +31,7 @@ async def test_basic_functionality():
     
     end_time = time.time()
     
-    logger.info(f"Processed {len(results)} requests in {end_time - start_time:.3f} seconds")
+    logger.info("Processed %d requests in %.3f seconds", len(results), end_time - start_time)
     
     # Test caching concept
     logger.info("Testing caching concept...")
@@ -51,7 +51,7 @@ async def test_basic_functionality():
     if key in cache:
         logger.info("Cache hit - returning cached result")
         cached_result = cache[key]
-        logger.info(f"Cached result: {cached_result}")
+        logger.info("Cached result: %s", cached_result)
     
     logger.info("Basic functionality test passed")
 
@@ -4,21 +4,155 @@ Checks that all required methods and features are implemented
 """
 
 import ast
+import hashlib
 import inspect
+import json
+import mmap
+import re
+from pathlib import Path
+
+# Verification results are memoized on a content hash so repeated CI /
+# pre-commit invocations skip the scans when the optimizer source is unchanged
+_RESULT_CACHE_FILE = Path.home() / ".cache" / "cmga_verify.json"
+
+
+def _load_result_cache():
+    """Load the cached {content_hash: result} map, tolerating a missing file"""
+    try:
+        with open(_RESULT_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_result_cache(cache):
+    """Persist the result cache; failures are non-fatal (cache is advisory)"""
+    try:
+        _RESULT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(_RESULT_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+# Static keyword groups: the needle sets never change at runtime, so the
+# combined scanner pattern is compiled exactly once at import time
+
+# Check for specific AI optimization features in the code
+AI_FEATURES = {
+    "Data preprocessing pipeline": "_preprocess_optimization_data",
+    "Vertex AI optimization API": "_execute_vertex_ai_optimization",
+    "Confidence interval calculation": "_calculate_confidence_intervals",
+    "Model explanations": "_generate_model_explanations",
+    "Multi-objective optimization": "multi_objective_portfolio",
+    "Sharpe ratio optimization": "_validate_sharpe_ratio_optimization",
+    "Bootstrap sampling": "bootstrap_sampling",
+    "Correlation matrix": "_calculate_correlation_matrix",
+    "Resource efficiency": "_calculate_resource_efficiency"
+}
+
+# Check for enhanced data structures
+ENHANCED_STRUCTURES = [
+    "OptimizedPortfolioWithConfidence",
+    "confidence_intervals",
+    "model_explanations",
+    "ai_recommendations",
+    "processing_metadata"
+]
+
+# Critical case-sensitive markers for the final verdict
+CRITICAL_KEYWORDS = [
+    "_preprocess_optimization_data",
+    "_execute_vertex_ai_optimization",
+    "_calculate_confidence_intervals"
+]
+
+# Check for requirement compliance (matched case-insensitively)
+REQUIREMENTS_CHECK = {
+    "Requirement 1.4 (Sharpe ratio optimization)": "sharpe_ratio_optimization",
+    "Requirement 1.5 (Confidence scores)": "confidence_scores",
+    "Task 3.2 (Data preprocessing)": "preprocessing_pipeline",
+    "Task 3.2 (Vertex AI integration)": "vertex_ai_optimization",
+    "Task 3.2 (Confidence intervals)": "confidence_interval"
+}
+
+# Critical case-insensitive markers for the final verdict
+CRITICAL_KEYWORDS_CI = ["sharpe_ratio", "confidence", "vertex_ai"]
+
+_SCAN_NEEDLES = sorted(
+    set(AI_FEATURES.values()) | set(ENHANCED_STRUCTURES) | set(CRITICAL_KEYWORDS),
+    key=len, reverse=True
+)
+_SCAN_NEEDLES_CI = sorted(
+    set(REQUIREMENTS_CHECK.values()) | set(CRITICAL_KEYWORDS_CI),
+    key=len, reverse=True
+)
+# Needles are pre-encoded once so the scan and its containment post-checks
+# run entirely over bytes with no per-call encoding in the loop
+_SCAN_NEEDLES_BYTES = [(n, n.encode()) for n in _SCAN_NEEDLES]
+_SCAN_NEEDLES_CI_BYTES = [(n, n.encode()) for n in _SCAN_NEEDLES_CI]
+# Single alternation (longest first) so one pass over the buffer covers every
+# keyword group; case-insensitive needles are inlined as (?i:...) branches so
+# no lowercased copy of the file ever needs to be materialized
+_KEYWORD_SCANNER = re.compile(b"|".join(
+    [re.escape(nb) for _, nb in _SCAN_NEEDLES_BYTES]
+    + [b"(?i:" + re.escape(nb) + b")" for _, nb in _SCAN_NEEDLES_CI_BYTES]
+))
+
+# Compiled once at import time; matches def/async def statements so the
+# rough method count does not hit comments or string literals
+_DEF_RE = re.compile(rb"^[ \t]*(?:async[ \t]+)?def[ \t]+(\w+)[ \t]*\(", re.MULTILINE)
+
+
+def _find_present(content):
+    """Single-pass multi-pattern scan over the raw bytes buffer.
+
+    Returns (case_sensitive_hits, case_insensitive_hits); containment
+    post-checks recover needles nested inside longer matches.
+    """
+    matched = {m.group(0) for m in _KEYWORD_SCANNER.finditer(content)}
+    matched_lower = {m.lower() for m in matched}
+    present = {
+        n for n, nb in _SCAN_NEEDLES_BYTES if any(nb in m for m in matched)
+    }
+    present_ci = {
+        n for n, nb in _SCAN_NEEDLES_CI_BYTES
+        if any(nb in m for m in matched_lower)
+    }
+    return present, present_ci
+
 
 def verify_ai_optimization_implementation():
     """Verify that all AI optimization features are implemented"""
-    
+
     print("🔍 Verifying AI-powered optimization algorithms implementation...")
-    
-    # Read the portfolio optimizer file
-    with open('portfolio_optimizer_adk.py', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Use simple string parsing instead of AST to avoid parsing issues
+
+    # Memory-map the optimizer source: scans run straight over the page cache
+    # without materializing a decoded str copy of the whole file
+    with open('portfolio_optimizer_adk.py', 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        # blake2b hashes the mapped buffer directly; if the source is
+        # unchanged since a previous run, reuse the recorded verdict
+        content_key = hashlib.blake2b(content, digest_size=16).hexdigest()
+        result_cache = _load_result_cache()
+        if content_key in result_cache:
+            cached = result_cache[content_key]
+            print(f"♻️  Source unchanged, reusing cached verdict: "
+                  f"{'VERIFIED' if cached else 'INCOMPLETE'}")
+            return cached
+
+        result = _verify_source(content)
+        result_cache[content_key] = result
+        _save_result_cache(result_cache)
+        return result
+
+
+def _verify_source(content):
+    """Run the verification checks over the mapped source buffer"""
+
     required_methods = [
         '_preprocess_optimization_data',
-        '_execute_vertex_ai_optimization', 
+        '_execute_vertex_ai_optimization',
         '_enhance_with_confidence_and_explanations',
         '_validate_sharpe_ratio_optimization',
         '_calculate_confidence_intervals',
@@ -27,7 +161,7 @@ def verify_ai_optimization_implementation():
         '_calculate_enhanced_portfolio_metrics',
         '_generate_confidence_based_recommendations'
     ]
-    
+
     # Check for helper methods
     helper_methods = [
         '_get_seasonal_factor',
@@ -37,107 +171,74 @@ def verify_ai_optimization_implementation():
         '_calculate_allocation_confidence',
         '_calculate_sharpe_percentile'
     ]
-    
-    # Count total methods in the class
-    method_count = content.count('def ')
-    print(f"📊 Found approximately {method_count} methods in file")
-    
-    # Verify required methods using string search
-    missing_methods = []
-    found_methods = []
-    
-    for method in required_methods + helper_methods:
-        if f'def {method}(' in content:
-            found_methods.append(method)
-        else:
-            missing_methods.append(method)
-    
+
+    # Verify required methods against the parsed AST: one parse, then O(1)
+    # set lookups, with no false positives from comments or docstrings
+    tree = ast.parse(bytes(content))
+    defined_methods = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Keep the first definition per name; line spans come straight
+            # from the parsed nodes so no further buffer passes are needed
+            defined_methods.setdefault(node.name, node.end_lineno - node.lineno + 1)
+    all_methods = required_methods + helper_methods
+    found_methods = [m for m in all_methods if m in defined_methods]
+    missing_methods = [m for m in all_methods if m not in defined_methods]
+
+    # Short-circuit before any decorative scanning: a missing required
+    # method already decides the verdict, so the failure path stops here
     if missing_methods:
         print(f"❌ Missing required methods: {missing_methods}")
         return False
-    
+
+    # Count total methods in the class
+    method_count = sum(1 for _ in _DEF_RE.finditer(content))
+    print(f"📊 Found approximately {method_count} methods in file")
+
     print(f"✅ All {len(found_methods)} required AI optimization methods found")
-    
-    # Check for specific AI optimization features in the code
-    ai_features = {
-        "Data preprocessing pipeline": "_preprocess_optimization_data",
-        "Vertex AI optimization API": "_execute_vertex_ai_optimization", 
-        "Confidence interval calculation": "_calculate_confidence_intervals",
-        "Model explanations": "_generate_model_explanations",
-        "Multi-objective optimization": "multi_objective_portfolio",
-        "Sharpe ratio optimization": "_validate_sharpe_ratio_optimization",
-        "Bootstrap sampling": "bootstrap_sampling",
-        "Correlation matrix": "_calculate_correlation_matrix",
-        "Resource efficiency": "_calculate_resource_efficiency"
-    }
-    
+
+    # One precompiled pass over the file covers every keyword group,
+    # including the critical markers checked in the final verdict
+    present_keywords, present_keywords_ci = _find_present(content)
+
     print("\n🔍 Checking AI optimization features:")
-    for feature, keyword in ai_features.items():
-        if keyword in content:
+    for feature, keyword in AI_FEATURES.items():
+        if keyword in present_keywords:
             print(f"✅ {feature}: Found")
         else:
             print(f"❌ {feature}: Not found")
-    
-    # Check for requirement compliance
-    requirements_check = {
-        "Requirement 1.4 (Sharpe ratio optimization)": "sharpe_ratio_optimization",
-        "Requirement 1.5 (Confidence scores)": "confidence_scores",
-        "Task 3.2 (Data preprocessing)": "preprocessing_pipeline",
-        "Task 3.2 (Vertex AI integration)": "vertex_ai_optimization",
-        "Task 3.2 (Confidence intervals)": "confidence_interval"
-    }
-    
+
     print("\n📋 Checking requirement compliance:")
-    for req, keyword in requirements_check.items():
-        if keyword in content.lower():
+    for req, keyword in REQUIREMENTS_CHECK.items():
+        if keyword in present_keywords_ci:
             print(f"✅ {req}: Implemented")
         else:
             print(f"⚠️  {req}: Keyword not found (may still be implemented)")
-    
-    # Check for enhanced data structures
-    enhanced_structures = [
-        "OptimizedPortfolioWithConfidence",
-        "confidence_intervals",
-        "model_explanations", 
-        "ai_recommendations",
-        "processing_metadata"
-    ]
-    
+
     print("\n🏗️  Checking enhanced data structures:")
-    for structure in enhanced_structures:
-        if structure in content:
+    for structure in ENHANCED_STRUCTURES:
+        if structure in present_keywords:
             print(f"✅ {structure}: Found")
         else:
             print(f"❌ {structure}: Not found")
-    
-    # Count lines of AI optimization code
-    ai_method_lines = 0
-    for method in required_methods + helper_methods:
-        method_start = content.find(f"def {method}(")
-        if method_start != -1:
-            # Count lines until next method or end of class
-            method_content = content[method_start:]
-            next_method = method_content.find("\n    def ")
-            if next_method != -1:
-                method_content = method_content[:next_method]
-            ai_method_lines += len(method_content.split('\n'))
-    
+
+    # Count lines of AI optimization code from the AST line spans collected
+    # above; no additional pass over the buffer is needed
+    ai_method_lines = sum(defined_methods[m] for m in found_methods)
+
     print(f"\n📏 AI optimization code: ~{ai_method_lines} lines")
-    
-    # Final verification
-    critical_features = [
-        "_preprocess_optimization_data" in content,
-        "_execute_vertex_ai_optimization" in content,
-        "_calculate_confidence_intervals" in content,
-        "sharpe_ratio" in content.lower(),
-        "confidence" in content.lower(),
-        "vertex_ai" in content.lower()
-    ]
-    
-    if all(critical_features):
+
+    # Final verification: every critical marker was already covered by the
+    # consolidated scan, so the verdict is pure set membership
+    critical_ok = (
+        all(k in present_keywords for k in CRITICAL_KEYWORDS)
+        and all(k in present_keywords_ci for k in CRITICAL_KEYWORDS_CI)
+    )
+
+    if critical_ok:
         print("\n🎉 AI-powered optimization algorithms implementation VERIFIED!")
         print("   ✅ Data preprocessing pipeline implemented")
-        print("   ✅ Vertex AI optimization API integration implemented") 
+        print("   ✅ Vertex AI optimization API integration implemented")
         print("   ✅ Confidence interval calculation implemented")
         print("   ✅ Model explanation features implemented")
         print("   ✅ Sharpe ratio optimization implemented")
@@ -152,4 +253,4 @@ if __name__ == "__main__":
         print("\n✅ Task 3.2 implementation verification PASSED!")
     else:
         print("\n❌ Task 3.2 implementation verification FAILED!")
-        exit(1)
\ No newline at end of file
+        exit(1)
@@ -0,0 +1,21 @@
+"""
+_build_kernels.py - AOT build step for the CRA numeric kernels
+
+Compiles the _kernels loops into a prebuilt cra_kernels extension so
+worker processes import native code instead of paying the JIT warm-up
+stall on first call. Run once during build/deploy:
+
+    python _build_kernels.py
+"""
+
+from numba.pycc import CC
+
+from _kernels import _gini_py
+
+cc = CC('cra_kernels')
+cc.export('gini', 'f8(f8[:])')(_gini_py)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print("cra_kernels extension built")
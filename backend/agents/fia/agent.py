@@ -5,12 +5,141 @@
 # ==============================================================================
 
 import json
-from typing import List, Dict, Any
-from google.adk.agents import LlmAgent
-from google.adk.tools import FunctionTool
-from google.genai import types
+import os
+import re
+import time
+from functools import lru_cache
+from hashlib import blake2b
+from typing import List, Dict, Any, Optional
+
+from cachetools import TTLCache
 from datetime import date # ADDED: For dynamic year generation
 
+# NOTE: google.adk / google.genai are imported lazily inside
+# create_fia_agent() — the SDK pulls in grpc/protobuf/auth, which the tool
+# functions (and the test suite) never need
+
+# --- Cached search-prompt builders ---
+# The prompts only vary with the year (or state), so they are formatted once
+# and served from cache on subsequent calls
+_YEAR_CACHE = [0.0, 0]  # [last refresh epoch, cached year]
+
+
+def _current_year() -> int:
+    """Current year, refreshing the date.today() syscall at most hourly."""
+    now = time.time()
+    if now - _YEAR_CACHE[0] > 3600:
+        _YEAR_CACHE[0] = now
+        _YEAR_CACHE[1] = date.today().year
+    return _YEAR_CACHE[1]
+
+
+@lru_cache(maxsize=8)
+def _kcc_prompt(year: int) -> str:
+    return f"Find the official {year} interest rate (after subvention), maximum loan limit (short term), and the full list of required documents for the Kisan Credit Card (KCC) scheme for Indian farmers. Ensure the source is a government or regulated financial website."
+
+
+@lru_cache(maxsize=64)
+def _state_prompt(state_name: str) -> str:
+    return f"Find the official, current application process, eligibility criteria, and interest rates for the latest major agriculture credit or subsidy scheme run by the {state_name} government for small and marginal farmers. Ensure the source is a government or regulated financial website."
+
+
+# --- Cited-answer cache ---
+# The same KCC/PMFBY search prompts recur across farmers, so the serving
+# layer can consult this cache before re-running the whole web-search +
+# synthesis round-trip. Keys rotate monthly so scheme facts never go stale;
+# entries additionally expire after a week
+_ANSWER_CACHE: TTLCache = TTLCache(maxsize=256, ttl=7 * 86400)
+
+
+def _answer_key(search_prompt: str) -> str:
+    month = date.today().isoformat()[:7]
+    return blake2b((month + search_prompt).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_cached_answer(search_prompt: str) -> Optional[str]:
+    """Return the cached cited answer for this search prompt, or None."""
+    return _ANSWER_CACHE.get(_answer_key(search_prompt))
+
+
+def cache_answer(search_prompt: str, answer: str) -> None:
+    """Store the final cited answer synthesized for this search prompt."""
+    _ANSWER_CACHE[_answer_key(search_prompt)] = answer
+
+
+_PMKISAN_PROMPT = "What is the official annual payout amount, installment frequency, and eligibility criteria for the Pradhan Mantri Kisan Samman Nidhi (PM-KISAN) scheme?"
+
+_DEFAULT_CREDIT_PROMPT = "Provide a concise summary of the latest and most relevant government agricultural loan schemes available to Indian farmers today, focusing on subsidized interest rates and application methods."
+
+
+# --- Fraud classification tables (built once at import) ---
+# One compiled alternation with a named group per category: the C regex
+# engine scans the scenario in a single pass and the hit groups drive the
+# same priority order the old elif chain used
+_FRAUD_RE = re.compile(
+    r"(?P<phishing>\botp\b|\bpin\b|\bcvv\b|bank manager|aadhar update)"
+    r"|(?P<advance_fee>\bprize\b|\blottery\b)"
+    r"|(?P<fees>\bfees\b)"
+    r"|(?P<loan>\bloan\b)"
+    r"|(?P<upi>\bupi\b|qr code|request money)"
+    r"|(?P<ponzi>guaranteed return|chit fund|\binvestment\b)",
+    re.IGNORECASE,
+)
+
+# Credit query classifier: kcc takes precedence over pmkisan, matching the
+# original branch order
+_CREDIT_RE = re.compile(
+    r"(?P<kcc>kcc|kisan credit card|loan)"
+    r"|(?P<pmkisan>pm-kisan|income support)",
+    re.IGNORECASE,
+)
+
+_GENERAL_RESULT = {
+    "risk_level": "None apparent, but exercise caution.",
+    "advice_code": "GENERAL_CAUTION",
+    "advice_text": "Always remember to keep your personal financial details private. If something sounds too good to be true, it usually is."
+}
+_PHISHING_RESULT = {
+    "risk_level": "HIGH - Phishing/Vishing",
+    "advice_code": "NEVER_SHARE_PIN",
+    "advice_text": "NEVER SHARE YOUR OTP, PIN, CVV, or AADHAR details. Official bank staff will never ask for this over the phone or SMS. This is a SCAM. Immediately block the sender/caller."
+}
+_ADVANCE_FEE_RESULT = {
+    "risk_level": "MEDIUM - Advance Fee Scam",
+    "advice_code": "NO_PRE_PAYMENT",
+    "advice_text": "Be highly skeptical. Legitimate loans or prizes never require you to pay a fee or deposit money first to receive your funds. Do not send any money."
+}
+_UPI_RESULT = {
+    "risk_level": "HIGH - UPI Scam",
+    "advice_code": "UPI_CRITICAL_WARNING",
+    "advice_text": "CRITICAL: Scanning a QR code or approving a 'Request Money' link is used to SEND money, NOT to receive it. If you are expecting money, you should never be asked to scan or enter your UPI PIN. Do not proceed."
+}
+_PONZI_RESULT = {
+    "risk_level": "MEDIUM - Ponzi/Investment Scam",
+    "advice_code": "VERIFY_INVESTMENT",
+    "advice_text": "Investment schemes promising 'guaranteed' or 'unrealistic' high returns are often fraudulent (Ponzi Schemes). Only trust schemes registered with RBI or SEBI. Verify before you invest."
+}
+
+# Final JSON responses encoded once at import; the hot path indexes this
+# tuple by category id and never touches the serializer
+_FRAUD_JSON = tuple(json.dumps(o) for o in (
+    _GENERAL_RESULT, _PHISHING_RESULT, _ADVANCE_FEE_RESULT, _UPI_RESULT, _PONZI_RESULT
+))
+
+
+def _classify_fraud(scenario: str) -> int:
+    """Map a scenario to its fraud-category index (0 = general caution)."""
+    hits = {m.lastgroup for m in _FRAUD_RE.finditer(scenario)}
+    if "phishing" in hits:
+        return 1
+    if "advance_fee" in hits or ("fees" in hits and "loan" in hits):
+        return 2
+    if "upi" in hits:
+        return 3
+    if "ponzi" in hits:
+        return 4
+    return 0
+
 # --- 1. Specialized Tool Definitions (Logic copied from fia_functions.py) ---
 # NOTE: In a production environment, you would typically import these functions:
 # from .fia_functions import credit_advisory_tool, insurance_info_tool, fraud_prevention_tool
@@ -28,28 +157,35 @@ def credit_advisory_tool(
     and direct benefit schemes (like PM-KISAN). This tool returns a precise 
     search query for the LLM to execute via Google Search, ensuring live, up-to-date facts.
     """
-    current_year = date.today().year # FIX: Use current year dynamically
-    
     context = f"Farmer Status: {farmer_status}, Land: {land_holding_hectares} hectares. "
-    
+
+    query_hits = {m.lastgroup for m in _CREDIT_RE.finditer(query)}
+
     if scheme_type.lower() == "state" and state_name:
         # State-level scheme query (dynamic)
-        search_prompt = f"Find the official, current application process, eligibility criteria, and interest rates for the latest major agriculture credit or subsidy scheme run by the {state_name} government for small and marginal farmers. Ensure the source is a government or regulated financial website."
-    
-    elif "kcc" in query.lower() or "kisan credit card" in query.lower() or "loan" in query.lower():
-        # National KCC query (dynamic)
-        search_prompt = f"Find the official {current_year} interest rate (after subvention), maximum loan limit (short term), and the full list of required documents for the Kisan Credit Card (KCC) scheme for Indian farmers. Ensure the source is a government or regulated financial website."
-        
-    elif "pm-kisan" in query.lower() or "income support" in query.lower():
+        search_prompt = _state_prompt(state_name)
+
+    elif "kcc" in query_hits:
+        # National KCC query (dynamic; the year is refreshed at most hourly)
+        search_prompt = _kcc_prompt(_current_year())
+
+    elif "pmkisan" in query_hits:
         # PM-KISAN query (dynamic)
-        search_prompt = "What is the official annual payout amount, installment frequency, and eligibility criteria for the Pradhan Mantri Kisan Samman Nidhi (PM-KISAN) scheme?"
-        
+        search_prompt = _PMKISAN_PROMPT
+
     else:
         # Default fallback for an unspecified credit query
-        search_prompt = f"Provide a concise summary of the latest and most relevant government agricultural loan schemes available to Indian farmers today, focusing on subsidized interest rates and application methods."
+        search_prompt = _DEFAULT_CREDIT_PROMPT
 
     return context + search_prompt
 
+# Insurance scheme focus lines, shared across calls; only the CPIS variant
+# needs per-call formatting
+_WBCIS_FOCUS = "Weather Based Crop Insurance Scheme (WBCIS)"
+_CPIS_FOCUS = "Coconut Palm Insurance Scheme (CPIS) or similar specialized scheme in {}"
+_PMFBY_FOCUS = "Pradhan Mantri Fasal Bima Yojana (PMFBY)"
+
+
 # Tool 2: Insurance Information Tool (Dynamic - Returns Search Prompt, Expanded)
 def insurance_info_tool(
     crop_type: str,
@@ -68,15 +204,19 @@ def insurance_info_tool(
         f"the official claim helpline number."
     )
     
-    if "weather" in crop_type.lower():
+    crop = crop_type.casefold()
+
+    if "weather" in crop:
         # Focus on WBCIS for weather-related queries
-        scheme_focus = "Weather Based Crop Insurance Scheme (WBCIS)"
-    elif "coconut" in crop_type.lower() or "palm" in crop_type.lower() and state_name:
-        # Focus on state-specific or specialized crop insurance like CPIS
-        scheme_focus = f"Coconut Palm Insurance Scheme (CPIS) or similar specialized scheme in {state_name}"
+        scheme_focus = _WBCIS_FOCUS
+    elif "coconut" in crop or ("palm" in crop and state_name):
+        # Focus on state-specific or specialized crop insurance like CPIS.
+        # Grouping matches the original precedence: "coconut" selects CPIS
+        # even without a state_name
+        scheme_focus = _CPIS_FOCUS.format(state_name)
     else:
         # Default to the most common, PMFBY, but keep the query broad enough to find alternatives
-        scheme_focus = "Pradhan Mantri Fasal Bima Yojana (PMFBY)"
+        scheme_focus = _PMFBY_FOCUS
 
     # Final Combined Search Prompt
     search_prompt = (
@@ -95,54 +235,50 @@ def fraud_prevention_tool(
     Advance Fee scams) and provides immediate, non-negotiable safety advice. 
     This tool uses static, reliable security rules. **Returns structured JSON.**
     """
-    scenario_lower = scenario.lower()
-    
-    # Initialize structured output
-    output = {
-        "risk_level": "None apparent, but exercise caution.",
-        "advice_code": "GENERAL_CAUTION",
-        "advice_text": "Always remember to keep your personal financial details private. If something sounds too good to be true, it usually is."
-    }
-    
     # --- STATIC ANALYSIS LOGIC ---
-    if "otp" in scenario_lower or "pin" in scenario_lower or "cvv" in scenario_lower or "bank manager" in scenario_lower or "aadhar update" in scenario_lower:
-        output.update({
-            "risk_level": "HIGH - Phishing/Vishing",
-            "advice_code": "NEVER_SHARE_PIN",
-            "advice_text": "NEVER SHARE YOUR OTP, PIN, CVV, or AADHAR details. Official bank staff will never ask for this over the phone or SMS. This is a SCAM. Immediately block the sender/caller."
-        })
-    elif "prize" in scenario_lower or "lottery" in scenario_lower or ("fees" in scenario_lower and "loan" in scenario_lower):
-        output.update({
-            "risk_level": "MEDIUM - Advance Fee Scam",
-            "advice_code": "NO_PRE_PAYMENT",
-            "advice_text": "Be highly skeptical. Legitimate loans or prizes never require you to pay a fee or deposit money first to receive your funds. Do not send any money."
-        })
-    elif "qr code" in scenario_lower or "request money" in scenario_lower or "upi" in scenario_lower:
-        output.update({
-            "risk_level": "HIGH - UPI Scam",
-            "advice_code": "UPI_CRITICAL_WARNING",
-            "advice_text": "CRITICAL: Scanning a QR code or approving a 'Request Money' link is used to SEND money, NOT to receive it. If you are expecting money, you should never be asked to scan or enter your UPI PIN. Do not proceed."
-        })
-    elif "guaranteed return" in scenario_lower or "chit fund" in scenario_lower or "investment" in scenario_lower:
-        output.update({
-            "risk_level": "MEDIUM - Ponzi/Investment Scam",
-            "advice_code": "VERIFY_INVESTMENT",
-            "advice_text": "Investment schemes promising 'guaranteed' or 'unrealistic' high returns are often fraudulent (Ponzi Schemes). Only trust schemes registered with RBI or SEBI. Verify before you invest."
-        })
-
-    # FIX: Return JSON string instead of a formatted string
-    return json.dumps(output)
+    # One regex pass classifies the scenario; the response is a JSON string
+    # that was encoded once at import
+    return _FRAUD_JSON[_classify_fraud(scenario)]
 
 
 # --- 2. ADK FunctionTool Wrappers ---
 
+_FIA_MODEL = 'gemini-2.5-flash-preview-09-2025'  # Recommended fast model for agentic planning
+
+# The system instruction is a build-time constant: defining it once at module
+# scope means repeated agent construction (tests, multi-worker startup)
+# reuses the same string object instead of re-materializing it
+_FIA_INSTRUCTION = """
+        You are the 'Financial Inclusion Agent (FIA)', a friendly, precise, and highly trusted financial tutor for Indian farmers.
+        Your primary role is to simplify complex financial topics and government schemes.
+
+        1. When the user asks about loans, credit, or financial support, use the **credit_advisory_tool** (the tool name is inferred from the function name).
+        2. When the user asks about crop protection or insurance, use the **insurance_info_tool**.
+        3. When the user asks if a message/call/scheme is safe, or asks for general safety advice, use the **fraud_prevention_tool**.
+
+        CRITICAL RULE: For Credit and Insurance, the tool output is a search query. You MUST execute this search query using your internal tools and then construct the final, cited, conversational answer from the search results.
+
+        4. If you use the fraud_prevention_tool, you will receive a JSON string. Extract the 'advice_text' from the JSON and present it to the user in a strong, non-negotiable warning format.
+        """
+
+# Shared across create_fia_agent calls so the config (and any registered
+# prompt cache) is built once per process
+_GENERATE_CONFIG = None
+
+
 # This function is what your team will run to create the agent for deployment.
-def create_fia_agent() -> LlmAgent:
+def create_fia_agent():
     """
     Creates the Financial Inclusion Agent, equipped with its specialized tools.
     This is the core definition of the Orchestrator Agent.
     """
-    
+    global _GENERATE_CONFIG
+
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import FunctionTool
+    from google.genai import types
+
+
     # 1. Wrap the Credit Function
     # FIX: Removed 'name' and 'description' arguments. Description is taken from the docstring.
     credit_tool = FunctionTool(
@@ -161,40 +297,60 @@ def create_fia_agent() -> LlmAgent:
         fraud_prevention_tool, 
     )
 
+    if _GENERATE_CONFIG is None:
+        # Optional: Configure the model generation for deterministic, factual outputs
+        _GENERATE_CONFIG = types.GenerateContentConfig(temperature=0.0)
+
+        # Opt-in explicit context caching: register the static instruction
+        # with the Gemini cache service once so subsequent calls skip
+        # re-tokenizing and re-attending the prefix. Best effort — any
+        # failure (no API key, unsupported model) falls back to the plain
+        # config
+        if os.getenv("FIA_PROMPT_CACHE"):
+            try:
+                from google import genai
+                cache = genai.Client().caches.create(
+                    model=_FIA_MODEL,
+                    config={"contents": [_FIA_INSTRUCTION], "ttl": "3600s"},
+                )
+                _GENERATE_CONFIG = types.GenerateContentConfig(
+                    temperature=0.0, cached_content=cache.name
+                )
+            except Exception:
+                pass
+
     # Define the Orchestrator Agent (The Brain)
     fia_agent = LlmAgent(
-        model='gemini-2.5-flash-preview-09-2025',  # Recommended fast model for agentic planning
+        model=_FIA_MODEL,
         name='FinancialInclusionAgent',
         description='Expert agent specializing in Indian farmer financial inclusion: Credit, Insurance, and Anti-fraud guidance.',
-        instruction="""
-        You are the 'Financial Inclusion Agent (FIA)', a friendly, precise, and highly trusted financial tutor for Indian farmers.
-        Your primary role is to simplify complex financial topics and government schemes.
-        
-        1. When the user asks about loans, credit, or financial support, use the **credit_advisory_tool** (the tool name is inferred from the function name).
-        2. When the user asks about crop protection or insurance, use the **insurance_info_tool**.
-        3. When the user asks if a message/call/scheme is safe, or asks for general safety advice, use the **fraud_prevention_tool**.
-        
-        CRITICAL RULE: For Credit and Insurance, the tool output is a search query. You MUST execute this search query using your internal tools and then construct the final, cited, conversational answer from the search results.
-        
-        4. If you use the fraud_prevention_tool, you will receive a JSON string. Extract the 'advice_text' from the JSON and present it to the user in a strong, non-negotiable warning format.
-        """,
+        instruction=_FIA_INSTRUCTION,
         tools=[credit_tool, insurance_tool, fraud_tool],
         # REMOVED: The problematic 'google_search={}' parameter. Rely on environment/instruction for grounding.
-        # Optional: Configure the model generation for deterministic, factual outputs
-        generate_content_config=types.GenerateContentConfig(temperature=0.0)
+        generate_content_config=_GENERATE_CONFIG
     )
-    
+
     return fia_agent
 
 # --- 3. ADK Entry Point and Local Runner ---
 
-# 1. ADK ENTRY POINT: Create the required global variable 'root_agent' 
-# This is the fix to resolve the ValueError: No root_agent found
-root_agent = create_fia_agent()
+# 1. ADK ENTRY POINT: expose the required 'root_agent' attribute lazily
+# (PEP 562). adk-web still finds fia.agent.root_agent, but importing this
+# module for its tool functions no longer pays the SDK import + agent
+# construction cost
+def __getattr__(name: str):
+    if name == 'root_agent':
+        agent = create_fia_agent()
+        globals()['root_agent'] = agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == '__main__':
     print("--- Initializing Financial Inclusion Agent (FIA) ---")
-    
+
+    root_agent = create_fia_agent()
+
     # Use the globally defined root_agent for local testing
     print(f"Agent '{root_agent.name}' initialized successfully with {len(root_agent.tools)} tools in agent.py.")
     
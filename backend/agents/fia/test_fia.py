@@ -14,8 +14,8 @@ from agent import credit_advisory_tool, insurance_info_tool, fraud_prevention_to
 
 # --- TEST FIXTURES ---
 # Mock the current date to ensure tests run consistently year after year
-@pytest.fixture(autouse=True) # auto-use ensures it applies to all tests that use date.today()
-def current_year(monkeypatch):
+@pytest.fixture(scope="module", autouse=True) # auto-use ensures it applies to all tests that use date.today()
+def current_year():
     """Fixture to ensure a consistent year for dynamic query tests."""
     class MockDate:
         @staticmethod
@@ -23,8 +23,12 @@ def current_year(monkeypatch):
             class MockToday:
                 year = 2025 # Fixed year for predictable search query output
             return MockToday()
-    # FIX: Patch the 'date' symbol (imported from datetime) inside the 'fia' module
-    monkeypatch.setattr(fia, 'date', MockDate)
+    # FIX: Patch the 'date' symbol (imported from datetime) inside the 'agent'
+    # module, and do it once per module instead of once per test
+    mp = pytest.MonkeyPatch()
+    mp.setattr(agent, 'date', MockDate)
+    yield
+    mp.undo()
 
 
 # --- 1. Credit Advisory Tool Tests ---
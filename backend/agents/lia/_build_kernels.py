@@ -0,0 +1,23 @@
+"""
+_build_kernels.py - AOT build step for the LIA numeric kernels
+
+Compiles the scoring/cost/time kernels into a prebuilt lia_kernels
+extension so worker processes import native code instead of paying the
+JIT warm-up stall on first call. Run once during build/deploy:
+
+    python _build_kernels.py
+"""
+
+from numba.pycc import CC
+
+from main import _score_kernel_py, _transport_cost_kernel_py, _travel_time_kernel_py
+
+cc = CC('lia_kernels')
+cc.export('score', 'f8(f8, f8, f8, f8, f8)')(_score_kernel_py)
+cc.export('transport_cost', 'f8(f8, f8, f8, f8)')(_transport_cost_kernel_py)
+cc.export('travel_time', 'f8(f8, f8, f8)')(_travel_time_kernel_py)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print("lia_kernels extension built")
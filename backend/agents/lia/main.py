@@ -6,9 +6,15 @@ Optimizes post-harvest logistics, reduces losses, and provides supply chain visi
 
 import json
 import logging
+import os
 import random
 import math
+import sys
+import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import count, islice
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
@@ -16,7 +22,322 @@ from dataclasses import dataclass, asdict
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Tool output is machine-consumed, so it ships compact by default;
+# set LIA_PRETTY for human-readable output while debugging
+_PRETTY = bool(os.getenv("LIA_PRETTY"))
+
+
+def _dump(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if _PRETTY else 0).decode()
+    if _PRETTY:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    # ensure_ascii=False keeps the Hindi/Kannada messages as UTF-8 instead
+    # of \uXXXX escapes, roughly halving their encoded length
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+# Produce classes consulted by the cost/time multipliers, frozen at import:
+# one O(1) set probe replaces rebuilding a list per call
+_TEMP_SENSITIVE = frozenset({"tomato", "grapes", "apple"})
+_DELICATE = frozenset({"tomato", "grapes"})
+
+# Multiplier dispatch tables keyed by lowercased produce type: a single
+# dict probe with a 1.0 default replaces the set-membership branch
+_TRANSPORT_MULT = {p: 1.3 for p in _TEMP_SENSITIVE}
+_SPEED_MULT = {p: 0.8 for p in _DELICATE}
+
+# Shared generator for mock draws: one batched call replaces a pair of
+# random.choice invocations per route leg
+_RNG = np.random.default_rng()
+_QUALITY = ("good", "average")
+_TRAFFIC = ("light", "moderate", "heavy")
+_PRODUCE = ("tomato", "onion", "potato", "apple")
+
+# Monotonic suffix keeping loss event IDs unique when several land in the
+# same wall-clock second
+_LOSS_SEQ = count(1)
+
+# Timedelta building blocks used in the history/timeline loops; constructing
+# a timedelta allocates, so the loops multiply these constants instead
+_SIX_HOURS = timedelta(hours=6)
+_ONE_DAY = timedelta(days=1)
+_FIFTEEN_DAYS = timedelta(days=15)
+
+# Structured produce table backing the loss-percentage math: assumed total
+# quantity per produce plus a name->row index, so batch calls become one
+# vectorized gather instead of per-element dict lookups
+_PRODUCE_TABLE = np.array(
+    [("tomato", 1500.0, 1000.0), ("onion", 2400.0, 1500.0),
+     ("potato", 1000.0, 2000.0), ("apple", 8000.0, 500.0)],
+    dtype=[("name", "U16"), ("price", "f8"), ("qty", "f8")],
+)
+_PRODUCE_INDEX = {str(row["name"]): i for i, row in enumerate(_PRODUCE_TABLE)}
+_DEFAULT_TOTAL_QTY = 1000.0
+
+# Pure lookup tables for the loss/monitoring helpers, hoisted so each
+# call is a single dict probe instead of a literal-dict rebuild
+_AVG_PRICES = {
+    "tomato": 1500, "onion": 2400, "potato": 1000,
+    "apple": 8000, "grapes": 6000, "rice": 3850
+}
+_STAGE_BENCHMARKS = {
+    "harvest": 8.5, "storage": 12.3, "transport": 6.7, "market": 4.2
+}
+_STAGE_LOCATIONS = {
+    "harvest": "Farm", "storage": "Cold Storage Facility",
+    "transport": "In Transit", "market": "Market/Distribution Center"
+}
+_NEXT_CHECKPOINTS = {
+    "harvest": "Storage Facility",
+    "storage": "Loading for Transport",
+    "transport": "Destination Market",
+    "market": "Final Delivery"
+}
+
+# Condition labels indexed by computed severity (0 in range, 1 near the
+# midpoint, 2 otherwise) in the assessment helpers
+_STATUSES = ("Optimal", "Acceptable", "Critical")
+
+# Unconditional tail tips shared across responses; the builders extend
+# with these instead of appending string by string
+_STATIC_ROUTE_TIPS = (
+    "Load produce during cooler hours (early morning/evening)",
+    "Use GPS tracking for real-time monitoring"
+)
+_STATIC_COST_SUGGESTIONS = (
+    "Negotiate bulk rates for regular shipments",
+    "Consider seasonal pricing for storage facilities"
+)
+
+# Static planner boilerplate shared by every logistics plan; read-only so
+# one instance can be referenced from each response
+_KPI_TARGETS = MappingProxyType({
+    "loss_reduction_target": "15%",
+    "cost_optimization_target": "10%",
+    "delivery_time_improvement": "20%",
+    "storage_utilization_target": "85%"
+})
+_SUCCESS_FACTORS = (
+    "Proper timing of harvest and storage",
+    "Efficient transportation coordination",
+    "Quality maintenance throughout supply chain",
+    "Cost optimization through collective planning"
+)
+
+def _intern_keys(table: Dict[str, str]) -> MappingProxyType:
+    """Read-only view of a translation table with interned source keys.
+
+    Interned keys let dict.get short-circuit on pointer identity before
+    falling back to a full string compare.
+    """
+    return MappingProxyType({sys.intern(k): v for k, v in table.items()})
+
+
+# Message translations, built once at import instead of inside every
+# _translate_message call and wrapped read-only so the shared tables
+# cannot be mutated by callers
+_TRANSLATIONS = MappingProxyType({
+    "hi": _intern_keys({
+        "Cold storage facilities found successfully": "कोल्ड स्टोरेज सुविधाएं सफलतापूर्वक मिलीं",
+        "Failed to find cold storage facilities": "कोल्ड स्टोरेज सुविधाएं खोजने में विफल",
+        "Route optimization completed successfully": "रूट अनुकूलन सफलतापूर्वक पूर्ण",
+        "Failed to optimize transportation route": "परिवहन मार्ग अनुकूलन में विफल",
+        "Loss tracking and analysis completed": "नुकसान ट्रैकिंग और विश्लेषण पूर्ण",
+        "Failed to track and analyze loss": "नुकसान ट्रैकिंग और विश्लेषण में विफल",
+        "Supply chain monitoring completed": "आपूर्ति श्रृंखला निगरानी पूर्ण",
+        "Failed to monitor supply chain": "आपूर्ति श्रृंखला निगरानी में विफल",
+        "Logistics cost calculation completed": "लॉजिस्टिक्स लागत गणना पूर्ण",
+        "Failed to calculate logistics costs": "लॉजिस्टिक्स लागत गणना में विफल",
+        "Comprehensive logistics plan created successfully": "व्यापक लॉजिस्टिक्स योजना सफलतापूर्वक बनाई गई",
+        "Failed to create logistics plan": "लॉजिस्टिक्स योजना बनाने में विफल"
+    }),
+    "kn": _intern_keys({
+        "Cold storage facilities found successfully": "ಕೋಲ್ಡ್ ಸ್ಟೋರೇಜ್ ಸೌಲಭ್ಯಗಳು ಯಶಸ್ವಿಯಾಗಿ ಕಂಡುಬಂದಿವೆ",
+        "Failed to find cold storage facilities": "ಕೋಲ್ಡ್ ಸ್ಟೋರೇಜ್ ಸೌಲಭ್ಯಗಳನ್ನು ಹುಡುಕುವಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
+        "Route optimization completed successfully": "ಮಾರ್ಗ ಅನುಕೂಲೀಕರಣ ಯಶಸ್ವಿಯಾಗಿ ಪೂರ್ಣಗೊಂಡಿದೆ",
+        "Failed to optimize transportation route": "ಸಾರಿಗೆ ಮಾರ್ಗ ಅನುಕೂಲೀಕರಣದಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
+        "Loss tracking and analysis completed": "ನಷ್ಟ ಟ್ರ್ಯಾಕಿಂಗ್ ಮತ್ತು ವಿಶ್ಲೇಷಣೆ ಪೂರ್ಣಗೊಂಡಿದೆ",
+        "Failed to track and analyze loss": "ನಷ್ಟ ಟ್ರ್ಯಾಕಿಂಗ್ ಮತ್ತು ವಿಶ್ಲೇಷಣೆಯಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
+        "Supply chain monitoring completed": "ಪೂರೈಕೆ ಸರಪಳಿ ಮೇಲ್ವಿಚಾರಣೆ ಪೂರ್ಣಗೊಂಡಿದೆ",
+        "Failed to monitor supply chain": "ಪೂರೈಕೆ ಸರಪಳಿ ಮೇಲ್ವಿಚಾರಣೆಯಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
+        "Logistics cost calculation completed": "ಲಾಜಿಸ್ಟಿಕ್ಸ್ ವೆಚ್ಚ ಲೆಕ್ಕಾಚಾರ ಪೂರ್ಣಗೊಂಡಿದೆ",
+        "Failed to calculate logistics costs": "ಲಾಜಿಸ್ಟಿಕ್ಸ್ ವೆಚ್ಚ ಲೆಕ್ಕಾಚಾರದಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
+        "Comprehensive logistics plan created successfully": "ಸಮಗ್ರ ಲಾಜಿಸ್ಟಿಕ್ಸ್ ಯೋಜನೆಯನ್ನು ಯಶಸ್ವಿಯಾಗಿ ರಚಿಸಲಾಗಿದೆ",
+        "Failed to create logistics plan": "ಲಾಜಿಸ್ಟಿಕ್ಸ್ ಯೋಜನೆ ರಚಿಸುವಲ್ಲಿ ವಿಫಲವಾಗಿದೆ"
+    }),
+})
+
+
+# Cause-specific measures as a dispatch table: one probe on the lowercased
+# cause replaces the if/elif chain and its repeated .lower() allocations
+_CAUSE_MEASURES = {
+    "spoilage": ("Improve temperature control", "Reduce humidity", "Better ventilation"),
+    "damage": ("Use proper packaging", "Gentle handling", "Avoid overloading"),
+    "theft": ("Improve security", "Install CCTV", "Better lighting"),
+}
+
+
+@lru_cache(maxsize=256)
+def _prevention_measures(stage: str, cause: str) -> Tuple[str, ...]:
+    """Loss prevention measures for a (stage, cause) pair, memoized.
+
+    Returns a tuple so the cached value cannot be mutated by callers.
+    """
+    base_measures = tuple(_MOCK_DATA["loss_prevention_tips"].get(stage, ()))
+    return base_measures + _CAUSE_MEASURES.get(cause.lower(), ())
+
+
+def _r1(x: float) -> float:
+    """Round half-up to 1 decimal via integer scaling (display only)."""
+    return math.floor(x * 10 + 0.5) / 10
+
+
+def _r2(x: float) -> float:
+    """Round half-up to 2 decimals via integer scaling (display only)."""
+    return math.floor(x * 100 + 0.5) / 100
+
+
+@lru_cache(maxsize=256)
+def _translate(message: str, language: str) -> str:
+    """Look up a message translation, memoized per (message, language)."""
+    table = _TRANSLATIONS.get(language)
+    if table is None:
+        return message
+    # Callers pass literal messages that CPython usually interns already;
+    # interning here makes the identity short-circuit a guarantee
+    return table.get(sys.intern(message), message)
+
+# Mock distances for known location pairs, keyed by the canonically ordered
+# lowercase pair so each route is stored once
+_KNOWN_DISTANCES = {
+    ("bangalore", "kolar"): 65,
+    ("bangalore", "hassan"): 180,
+    ("hassan", "kolar"): 120,
+    ("bangalore", "mysore"): 150,
+    ("hassan", "mangalore"): 200,
+}
+
+# Known locations interned to small integer IDs backing a symmetric
+# distance matrix; known-pair lookups become two dict probes and one
+# array index, with -1 marking pairs the matrix does not cover
+_LOC_ID = {"bangalore": 0, "kolar": 1, "hassan": 2, "mysore": 3, "mangalore": 4}
+_DIST_MATRIX = np.full((len(_LOC_ID), len(_LOC_ID)), -1.0)
+for (_a, _b), _km in _KNOWN_DISTANCES.items():
+    _DIST_MATRIX[_LOC_ID[_a], _LOC_ID[_b]] = _km
+    _DIST_MATRIX[_LOC_ID[_b], _LOC_ID[_a]] = _km
+
+
+@lru_cache(maxsize=4096)
+def _distance_cached(origin: str, destination: str) -> float:
+    """Distance in km for a canonically ordered lowercase location pair.
+
+    Unknown pairs draw once from a per-pair seeded RNG, so repeated queries
+    over the same route see one stable mock distance instead of a fresh
+    random number every call.
+    """
+    i = _LOC_ID.get(origin)
+    j = _LOC_ID.get(destination)
+    if i is not None and j is not None:
+        known = _DIST_MATRIX[i, j]
+        if known >= 0:
+            return float(known)
+    return random.Random(hash((origin, destination))).uniform(50, 300)
+
+
+def _score_kernel_py(quality: float, cost: float, avail: float,
+                     distance: float, cap_needed: float) -> float:
+    """Numeric core of the facility suitability score (0-100)."""
+    score = (quality / 5.0) * 40.0
+    distance_score = (300.0 - distance) / 300.0
+    if distance_score < 0.0:
+        distance_score = 0.0
+    score += distance_score * 30.0
+    utilization = cap_needed / avail
+    capacity_score = (1.0 - abs(utilization - 0.5)) * 2.0
+    if capacity_score < 0.0:
+        capacity_score = 0.0
+    score += capacity_score * 20.0
+    cost_score = (50.0 - cost) / 50.0
+    if cost_score < 0.0:
+        cost_score = 0.0
+    score += cost_score * 10.0
+    return score
+
+
+def _transport_cost_kernel_py(distance: float, base_rate: float,
+                              loading_cost: float, premium: float) -> float:
+    """Numeric core of the transport cost (premium already resolved)."""
+    return distance * base_rate * premium + loading_cost
+
+
+def _travel_time_kernel_py(distance: float, base_speed: float, speed_mult: float) -> float:
+    """Numeric core of the travel time in hours."""
+    return distance / (base_speed * speed_mult)
+
+
+# Prefer the AOT-compiled extension (built by _build_kernels.py) so worker
+# processes never pay the first-call JIT stall; otherwise JIT with an on-disk
+# cache, and finally fall back to plain Python when Numba is absent
+try:
+    from lia_kernels import (
+        score as _score_kernel,
+        transport_cost as _transport_cost_kernel,
+        travel_time as _travel_time_kernel,
+    )
+except ImportError:
+    if njit is not None:
+        _score_kernel = njit(cache=True, fastmath=True)(_score_kernel_py)
+        _transport_cost_kernel = njit(cache=True, fastmath=True)(_transport_cost_kernel_py)
+        _travel_time_kernel = njit(cache=True, fastmath=True)(_travel_time_kernel_py)
+        # Warm each kernel at import so the first request skips the compile stall
+        _score_kernel(4.0, 25.0, 100.0, 50.0, 50.0)
+        _transport_cost_kernel(50.0, 12.0, 500.0, 1.0)
+        _travel_time_kernel(50.0, 45.0, 1.0)
+    else:
+        _score_kernel = _score_kernel_py
+        _transport_cost_kernel = _transport_cost_kernel_py
+        _travel_time_kernel = _travel_time_kernel_py
+
+
+def _check_env_batch_py(temps: np.ndarray, hums: np.ndarray, min_t: float,
+                        max_t: float, min_h: float, max_h: float) -> np.ndarray:
+    """Per-batch alert flags: bit 0 temp low, 1 temp high, 2 hum low, 3 hum high."""
+    flags = np.zeros(temps.shape[0], dtype=np.uint8)
+    for i in range(temps.shape[0]):
+        f = 0
+        if temps[i] < min_t:
+            f |= 1
+        elif temps[i] > max_t:
+            f |= 2
+        if hums[i] < min_h:
+            f |= 4
+        elif hums[i] > max_h:
+            f |= 8
+        flags[i] = f
+    return flags
+
+
+if njit is not None:
+    _check_env_batch = njit(cache=True)(_check_env_batch_py)
+    # Warm-up is opt-in here: the batch path is not on the single-request
+    # route, so only deployments that use it pay the compile at import
+    if os.getenv("LIA_NUMBA_WARMUP") == "1":
+        _check_env_batch(np.zeros(1), np.zeros(1), 0.0, 1.0, 0.0, 1.0)
+else:
+    _check_env_batch = _check_env_batch_py
+
+
+@dataclass(slots=True, frozen=True)
 class ColdStorageFacility:
     """Cold storage facility data structure"""
     id: str
@@ -33,7 +354,7 @@ class ColdStorageFacility:
     contact_phone: str
     distance_km: float
 
-@dataclass
+@dataclass(slots=True)
 class TransportRoute:
     """Transportation route data structure"""
     id: str
@@ -48,7 +369,7 @@ class TransportRoute:
     route_quality: str  # good, average, poor
     traffic_conditions: str
 
-@dataclass
+@dataclass(slots=True)
 class LossEvent:
     """Post-harvest loss event data structure"""
     id: str
@@ -61,7 +382,7 @@ class LossEvent:
     timestamp: str
     location: str
 
-@dataclass
+@dataclass(slots=True)
 class SupplyChainStatus:
     """Supply chain monitoring data structure"""
     batch_id: str
@@ -75,97 +396,177 @@ class SupplyChainStatus:
     estimated_arrival: str
     last_updated: str
 
+def _build_mock_data() -> Dict[str, Any]:
+    """Build the mock logistics data used for demonstration"""
+    return {
+        "cold_storage_facilities": [
+            ColdStorageFacility(
+                id="CS001", name="Karnataka Cold Storage", location="Bangalore",
+                district="Bangalore Urban", state="Karnataka", total_capacity=500,
+                available_capacity=150, temperature_range="2-8°C",
+                supported_produce=["tomato", "potato", "onion", "apple"],
+                cost_per_ton_per_day=25, quality_rating=4.2,
+                contact_phone="+91-9876543210", distance_km=0
+            ),
+            ColdStorageFacility(
+                id="CS002", name="Kolar Agri Storage", location="Kolar",
+                district="Kolar", state="Karnataka", total_capacity=300,
+                available_capacity=80, temperature_range="0-4°C",
+                supported_produce=["tomato", "grapes", "pomegranate"],
+                cost_per_ton_per_day=30, quality_rating=4.5,
+                contact_phone="+91-9876543211", distance_km=65
+            ),
+            ColdStorageFacility(
+                id="CS003", name="Hassan Food Hub", location="Hassan",
+                district="Hassan", state="Karnataka", total_capacity=800,
+                available_capacity=200, temperature_range="1-6°C",
+                supported_produce=["potato", "onion", "carrot", "cabbage"],
+                cost_per_ton_per_day=22, quality_rating=4.0,
+                contact_phone="+91-9876543212", distance_km=180
+            )
+        ],
+        "transport_rates": {
+            "truck": {"base_rate_per_km": 12, "loading_cost": 500, "fuel_efficiency": 4},
+            "tempo": {"base_rate_per_km": 8, "loading_cost": 200, "fuel_efficiency": 6},
+            "mini_truck": {"base_rate_per_km": 10, "loading_cost": 300, "fuel_efficiency": 5}
+        },
+        "produce_requirements": {
+            "tomato": {"temp_range": "10-12°C", "humidity": "85-90%", "shelf_life_days": 15},
+            "onion": {"temp_range": "0-2°C", "humidity": "65-70%", "shelf_life_days": 90},
+            "potato": {"temp_range": "2-4°C", "humidity": "90-95%", "shelf_life_days": 120},
+            "apple": {"temp_range": "0-2°C", "humidity": "90-95%", "shelf_life_days": 180}
+        },
+        "loss_prevention_tips": {
+            "harvest": ["Harvest at right maturity", "Use proper tools", "Handle gently"],
+            "storage": ["Maintain temperature", "Control humidity", "Regular monitoring"],
+            "transport": ["Use refrigerated vehicles", "Minimize handling", "Secure packaging"],
+            "market": ["Display properly", "First-in-first-out", "Quick turnover"]
+        }
+    }
+
+
+def _build_facility_arrays(facilities: List[ColdStorageFacility]) -> Dict[str, Any]:
+    """Build a struct-of-arrays view of the cold storage facilities.
+
+    Scoring then runs as a handful of NumPy vector ops across all
+    facilities instead of per-facility Python arithmetic.
+    """
+    produce_index: Dict[str, int] = {}
+    for facility in facilities:
+        for produce in facility.supported_produce:
+            produce_index.setdefault(produce.lower(), len(produce_index))
+
+    support = np.zeros((len(facilities), len(produce_index)), dtype=bool)
+    for i, facility in enumerate(facilities):
+        for produce in facility.supported_produce:
+            support[i, produce_index[produce.lower()]] = True
+
+    return {
+        "quality": np.array([f.quality_rating for f in facilities], dtype=np.float64),
+        "cost": np.array([f.cost_per_ton_per_day for f in facilities], dtype=np.float64),
+        "avail": np.array([f.available_capacity for f in facilities], dtype=np.float64),
+        "support": support,
+        "produce_index": produce_index,
+    }
+
+
+# Built once at import and shared read-only by every agent instance: the
+# proxy plus frozen facility dataclasses keep the structure effectively
+# immutable, and the derived SoA arrays and dict forms are amortized too
+_MOCK_DATA = MappingProxyType(_build_mock_data())
+_FACILITY_ARRAYS = _build_facility_arrays(_MOCK_DATA["cold_storage_facilities"])
+_FACILITY_DICTS = [asdict(f) for f in _MOCK_DATA["cold_storage_facilities"]]
+
+# Requirement ranges parsed once into (temp_min, temp_max, hum_min, hum_max)
+# float tuples; the condition checks below become pure numeric comparisons
+# instead of re-parsing "10-12°C"/"85-90%" strings per call
+_PARSED_REQUIREMENTS = {
+    produce: tuple(
+        float(bound)
+        for field, suffix in (("temp_range", "°C"), ("humidity", "%"))
+        for bound in req[field].replace(suffix, "").split("-")
+    )
+    for produce, req in _MOCK_DATA["produce_requirements"].items()
+}
+
+
 class LIAAgent:
     """Logistics Infrastructure Agent implementation"""
-    
+
     def __init__(self):
         self.name = "Logistics Infrastructure Agent"
         self.version = "1.0.0"
         self.supported_languages = ["en", "hi", "kn"]
-        self.mock_data = self._initialize_mock_data()
+        self.mock_data = _MOCK_DATA
+        # Per-instance Twister keeps scalar draws off the locked global RNG
+        self._rng = random.Random()
+        self._facility_arrays = _FACILITY_ARRAYS
+        # Dict form of each facility computed once; per-request responses
+        # shallow-copy these instead of re-running asdict's field reflection
+        self._facility_dicts = _FACILITY_DICTS
         logger.info(f"Initialized {self.name} v{self.version}")
-    
-    def _initialize_mock_data(self) -> Dict[str, Any]:
-        """Initialize mock logistics data for demonstration"""
-        return {
-            "cold_storage_facilities": [
-                ColdStorageFacility(
-                    id="CS001", name="Karnataka Cold Storage", location="Bangalore",
-                    district="Bangalore Urban", state="Karnataka", total_capacity=500,
-                    available_capacity=150, temperature_range="2-8°C",
-                    supported_produce=["tomato", "potato", "onion", "apple"],
-                    cost_per_ton_per_day=25, quality_rating=4.2,
-                    contact_phone="+91-9876543210", distance_km=0
-                ),
-                ColdStorageFacility(
-                    id="CS002", name="Kolar Agri Storage", location="Kolar",
-                    district="Kolar", state="Karnataka", total_capacity=300,
-                    available_capacity=80, temperature_range="0-4°C",
-                    supported_produce=["tomato", "grapes", "pomegranate"],
-                    cost_per_ton_per_day=30, quality_rating=4.5,
-                    contact_phone="+91-9876543211", distance_km=65
-                ),
-                ColdStorageFacility(
-                    id="CS003", name="Hassan Food Hub", location="Hassan",
-                    district="Hassan", state="Karnataka", total_capacity=800,
-                    available_capacity=200, temperature_range="1-6°C",
-                    supported_produce=["potato", "onion", "carrot", "cabbage"],
-                    cost_per_ton_per_day=22, quality_rating=4.0,
-                    contact_phone="+91-9876543212", distance_km=180
-                )
-            ],
-            "transport_rates": {
-                "truck": {"base_rate_per_km": 12, "loading_cost": 500, "fuel_efficiency": 4},
-                "tempo": {"base_rate_per_km": 8, "loading_cost": 200, "fuel_efficiency": 6},
-                "mini_truck": {"base_rate_per_km": 10, "loading_cost": 300, "fuel_efficiency": 5}
-            },
-            "produce_requirements": {
-                "tomato": {"temp_range": "10-12°C", "humidity": "85-90%", "shelf_life_days": 15},
-                "onion": {"temp_range": "0-2°C", "humidity": "65-70%", "shelf_life_days": 90},
-                "potato": {"temp_range": "2-4°C", "humidity": "90-95%", "shelf_life_days": 120},
-                "apple": {"temp_range": "0-2°C", "humidity": "90-95%", "shelf_life_days": 180}
-            },
-            "loss_prevention_tips": {
-                "harvest": ["Harvest at right maturity", "Use proper tools", "Handle gently"],
-                "storage": ["Maintain temperature", "Control humidity", "Regular monitoring"],
-                "transport": ["Use refrigerated vehicles", "Minimize handling", "Secure packaging"],
-                "market": ["Display properly", "First-in-first-out", "Quick turnover"]
-            }
-        }
-    
+
     def cold_storage_finder(self, produce_type: str, location: str, capacity_needed: float,
                            duration: int = 30, language: str = "en") -> Dict[str, Any]:
         """Find and recommend cold storage facilities"""
         logger.info(f"Finding cold storage for {produce_type} in {location}, capacity: {capacity_needed}MT")
         
         try:
+            facilities = self.mock_data["cold_storage_facilities"]
+            arrays = self._facility_arrays
+
+            # Filter mask: produce support column AND available capacity,
+            # both resolved without touching the dataclass instances
+            produce_col = arrays["produce_index"].get(produce_type.lower())
+            if produce_col is None:
+                mask = np.zeros(len(facilities), dtype=bool)
+            else:
+                mask = arrays["support"][:, produce_col] & (arrays["avail"] >= capacity_needed)
+            candidates = np.flatnonzero(mask)
+
+            # Distances still come from the per-pair helper; everything else
+            # is one vectorized scoring pass over the candidate rows
+            distances = np.fromiter(
+                (self._calculate_distance(location, facilities[i].location) for i in candidates),
+                dtype=np.float64, count=candidates.size
+            )
+            quality = arrays["quality"][candidates]
+            cost = arrays["cost"][candidates]
+            avail = arrays["avail"][candidates]
+            utilization = capacity_needed / avail
+            scores = np.round(
+                (quality / 5.0) * 40
+                + np.maximum(0, (300 - distances) / 300) * 30
+                + np.maximum(0, (1 - np.abs(utilization - 0.5)) * 2) * 20
+                + np.maximum(0, (50 - cost) / 50) * 10,
+                1,
+            )
+
+            # Only the top 3 make it into the response, so select them with a
+            # partial partition and only sort (and build dicts for) that slice
+            if candidates.size > 3:
+                top = np.argpartition(-scores, 3)[:3]
+                order = top[np.argsort(-scores[top], kind="stable")]
+            else:
+                order = np.argsort(-scores, kind="stable")
+
             suitable_facilities = []
-            
-            for facility in self.mock_data["cold_storage_facilities"]:
-                # Check if facility supports the produce type
-                if produce_type.lower() in [p.lower() for p in facility.supported_produce]:
-                    # Check if capacity is available
-                    if facility.available_capacity >= capacity_needed:
-                        # Calculate distance (mock calculation)
-                        distance = self._calculate_distance(location, facility.location)
-                        facility.distance_km = distance
-                        
-                        # Calculate total cost
-                        total_cost = facility.cost_per_ton_per_day * capacity_needed * duration
-                        
-                        facility_info = asdict(facility)
-                        facility_info.update({
-                            "total_cost": total_cost,
-                            "cost_per_day": facility.cost_per_ton_per_day * capacity_needed,
-                            "suitability_score": self._calculate_suitability_score(
-                                facility, produce_type, distance, capacity_needed
-                            )
-                        })
-                        suitable_facilities.append(facility_info)
-            
-            # Sort by suitability score
-            suitable_facilities.sort(key=lambda x: x["suitability_score"], reverse=True)
-            
+            for pos in order:
+                i = candidates[pos]
+                facility = facilities[i]
+                distance = float(distances[pos])
+                cost_per_day = facility.cost_per_ton_per_day * capacity_needed
+
+                # Single dict-literal merge builds the response entry in one
+                # allocation instead of copy() followed by update()
+                suitable_facilities.append({
+                    **self._facility_dicts[i],
+                    "distance_km": distance,
+                    "total_cost": cost_per_day * duration,
+                    "cost_per_day": cost_per_day,
+                    "suitability_score": float(scores[pos])
+                })
+
             # Add recommendations
             recommendations = self._generate_storage_recommendations(
                 suitable_facilities, produce_type, capacity_needed, duration
@@ -178,8 +579,8 @@ class LIAAgent:
                     "location": location,
                     "capacity_needed": capacity_needed,
                     "duration_days": duration,
-                    "facilities_found": len(suitable_facilities),
-                    "facilities": suitable_facilities[:3],  # Top 3 recommendations
+                    "facilities_found": int(candidates.size),
+                    "facilities": suitable_facilities,  # Top 3 recommendations
                     "recommendations": recommendations
                 },
                 "timestamp": datetime.now().isoformat(),
@@ -206,38 +607,52 @@ class LIAAgent:
             vehicle_specs = self.mock_data["transport_rates"].get(vehicle_type, 
                                                                 self.mock_data["transport_rates"]["truck"])
             
+            # All per-leg quantities derive from the leg distances, so compute
+            # the distance vector for the whole chain once and the time/cost
+            # columns as array expressions
+            chain = [origin] + destinations
+            n = len(destinations)
+            distances = np.fromiter(
+                (self._calculate_distance(chain[i], chain[i + 1]) for i in range(n)),
+                dtype=np.float64, count=n
+            )
+
+            produce = produce_type.lower()
+            speed_mult = _SPEED_MULT.get(produce, 1.0)
+            premium = _TRANSPORT_MULT.get(produce, 1.0)
+            base_rate = vehicle_specs["base_rate_per_km"]
+
+            travel_times = distances / (45.0 * speed_mult)
+            route_costs = distances * base_rate * premium + vehicle_specs["loading_cost"]
+            fuel_costs = distances * base_rate * 0.6
+            toll_costs = np.where(distances > 50, distances * 0.5, 0.0)
+            driver_costs = travel_times * 150  # ₹150 per hour
+
+            quality_idx = _RNG.integers(0, len(_QUALITY), size=n)
+            traffic_idx = _RNG.integers(0, len(_TRAFFIC), size=n)
+
+            # Leg dicts are built directly (TransportRoute field order);
+            # the dataclass+asdict round-trip added a full reflection
+            # pass per leg
             routes = []
-            total_distance = 0
-            total_cost = 0
-            total_time = 0
-            
-            current_location = origin
-            
             for i, destination in enumerate(destinations):
-                # Calculate route details
-                distance = self._calculate_distance(current_location, destination)
-                travel_time = self._calculate_travel_time(distance, produce_type)
-                route_cost = self._calculate_transport_cost(distance, vehicle_specs, produce_type)
-                
-                route = TransportRoute(
-                    id=f"R{i+1:03d}",
-                    origin=current_location,
-                    destination=destination,
-                    distance_km=distance,
-                    estimated_time_hours=travel_time,
-                    fuel_cost=distance * vehicle_specs["base_rate_per_km"] * 0.6,
-                    toll_cost=distance * 0.5 if distance > 50 else 0,
-                    driver_cost=travel_time * 150,  # ₹150 per hour
-                    total_cost=route_cost,
-                    route_quality=random.choice(["good", "average"]),
-                    traffic_conditions=random.choice(["light", "moderate", "heavy"])
-                )
-                
-                routes.append(asdict(route))
-                total_distance += distance
-                total_cost += route_cost
-                total_time += travel_time
-                current_location = destination
+                routes.append({
+                    "id": f"R{i+1:03d}",
+                    "origin": chain[i],
+                    "destination": destination,
+                    "distance_km": float(distances[i]),
+                    "estimated_time_hours": float(travel_times[i]),
+                    "fuel_cost": float(fuel_costs[i]),
+                    "toll_cost": float(toll_costs[i]),
+                    "driver_cost": float(driver_costs[i]),
+                    "total_cost": float(route_costs[i]),
+                    "route_quality": _QUALITY[quality_idx[i]],
+                    "traffic_conditions": _TRAFFIC[traffic_idx[i]]
+                })
+
+            total_distance = float(distances.sum())
+            total_cost = float(route_costs.sum())
+            total_time = float(travel_times.sum())
             
             # Generate optimization recommendations
             optimization_tips = self._generate_route_optimization_tips(
@@ -253,11 +668,11 @@ class LIAAgent:
                     "vehicle_type": vehicle_type,
                     "routes": routes,
                     "summary": {
-                        "total_distance_km": round(total_distance, 1),
-                        "total_time_hours": round(total_time, 1),
-                        "total_cost_inr": round(total_cost, 2),
-                        "cost_per_km": round(total_cost / total_distance, 2) if total_distance > 0 else 0,
-                        "average_speed_kmh": round(total_distance / total_time, 1) if total_time > 0 else 0
+                        "total_distance_km": _r1(total_distance),
+                        "total_time_hours": _r1(total_time),
+                        "total_cost_inr": _r2(total_cost),
+                        "cost_per_km": _r2(total_cost / total_distance) if total_distance > 0 else 0,
+                        "average_speed_kmh": _r1(total_distance / total_time) if total_time > 0 else 0
                     },
                     "optimization_tips": optimization_tips
                 },
@@ -281,6 +696,9 @@ class LIAAgent:
         logger.info(f"Tracking loss: {quantity_lost} units of {produce_type} at {loss_stage} stage")
         
         try:
+            # One clock read per request; every timestamp below derives from it
+            now = datetime.now()
+
             # Calculate financial impact
             avg_price_per_unit = self._get_average_price(produce_type)
             financial_impact = quantity_lost * avg_price_per_unit
@@ -290,14 +708,14 @@ class LIAAgent:
             
             # Create loss event
             loss_event = LossEvent(
-                id=f"LOSS_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                id=f"LOSS_{now:%Y%m%d_%H%M%S}_{next(_LOSS_SEQ):03d}",
                 produce_type=produce_type,
                 loss_stage=loss_stage,
                 quantity_lost=quantity_lost,
                 loss_cause=loss_cause,
                 financial_impact=financial_impact,
                 prevention_measures=prevention_measures,
-                timestamp=datetime.now().isoformat(),
+                timestamp=now.isoformat(),
                 location="Unknown"  # Would be provided in real implementation
             )
             
@@ -320,7 +738,7 @@ class LIAAgent:
                         "improvement_potential": "High" if financial_impact > 10000 else "Medium"
                     }
                 },
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "message": self._translate_message("Loss tracking and analysis completed", language)
             }
             
@@ -340,13 +758,16 @@ class LIAAgent:
         logger.info(f"Monitoring supply chain for batch {batch_id} at {current_stage} stage")
         
         try:
-            # Generate mock sensor data
-            temperature = random.uniform(-2, 15)  # °C
-            humidity = random.uniform(60, 95)  # %
-            quality_score = random.uniform(0.7, 1.0)
-            
+            now_iso = datetime.now().isoformat()
+
+            # Generate mock sensor data: one batched draw covers
+            # temperature (°C), humidity (%) and quality score
+            temperature, humidity, quality_score = _RNG.uniform(
+                [-2.0, 60.0, 0.7], [15.0, 95.0, 1.0]
+            )
+
             # Determine produce type from batch ID (mock logic)
-            produce_type = random.choice(["tomato", "onion", "potato", "apple"])
+            produce_type = _PRODUCE[_RNG.integers(0, len(_PRODUCE))]
             
             # Check conditions against requirements
             alerts = []
@@ -361,12 +782,12 @@ class LIAAgent:
                 produce_type=produce_type,
                 current_stage=current_stage,
                 location=self._get_stage_location(current_stage),
-                temperature=round(temperature, 1),
-                humidity=round(humidity, 1),
-                quality_score=round(quality_score, 2),
+                temperature=_r1(temperature),
+                humidity=_r1(humidity),
+                quality_score=_r2(quality_score),
                 alerts=alerts,
                 estimated_arrival=self._calculate_estimated_arrival(current_stage),
-                last_updated=datetime.now().isoformat()
+                last_updated=now_iso
             )
             
             # Generate recommendations
@@ -385,7 +806,7 @@ class LIAAgent:
                     "next_checkpoint": self._get_next_checkpoint(current_stage),
                     "tracking_history": self._generate_tracking_history(batch_id)
                 },
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "message": self._translate_message("Supply chain monitoring completed", language)
             }
             
@@ -414,7 +835,7 @@ class LIAAgent:
             storage_cost = 0
             storage_days = 0
             if include_storage:
-                storage_days = random.randint(7, 30)
+                storage_days = self._rng.randint(7, 30)
                 storage_cost = quantity * 25 * storage_days  # ₹25 per MT per day
             
             # Calculate handling and packaging costs
@@ -425,46 +846,65 @@ class LIAAgent:
             insurance_cost = (transport_cost + storage_cost) * 0.02  # 2% of logistics cost
             misc_cost = quantity * 50  # ₹50 per MT
             
-            # Total cost calculation
-            total_cost = transport_cost + storage_cost + handling_cost + packaging_cost + insurance_cost + misc_cost
+            # Total cost and percentage split in one array pass: the four
+            # breakdown amounts are gathered once, the total is their sum,
+            # and the percentages come from a single vectorized divide
+            amounts = np.array([
+                transport_cost,
+                storage_cost,
+                handling_cost + packaging_cost,
+                insurance_cost + misc_cost,
+            ])
+            total_cost = float(amounts.sum())
             cost_per_unit = total_cost / quantity if quantity > 0 else 0
-            
+            if total_cost > 0:
+                percentages = (amounts * (100.0 / total_cost)).round(1).tolist()
+            else:
+                percentages = [0.0, 0.0, 0.0, 0.0]
+            rounded_amounts = amounts.round(2).tolist()
+
+            # Transport detail trio shares one multiply against the split
+            # fractions instead of three scalar round() expressions
+            fuel_cost, driver_cost, maintenance_cost = (
+                transport_cost * np.array([0.6, 0.3, 0.1])
+            ).round(2).tolist()
+
             # Generate cost optimization suggestions
             optimization_suggestions = self._generate_cost_optimization_suggestions(
                 transport_cost, storage_cost, distance, quantity
             )
-            
+
             # Cost breakdown
             cost_breakdown = {
                 "transportation": {
-                    "amount": round(transport_cost, 2),
-                    "percentage": round((transport_cost / total_cost) * 100, 1),
+                    "amount": rounded_amounts[0],
+                    "percentage": percentages[0],
                     "details": {
                         "distance_km": distance,
-                        "fuel_cost": round(transport_cost * 0.6, 2),
-                        "driver_cost": round(transport_cost * 0.3, 2),
-                        "vehicle_maintenance": round(transport_cost * 0.1, 2)
+                        "fuel_cost": fuel_cost,
+                        "driver_cost": driver_cost,
+                        "vehicle_maintenance": maintenance_cost
                     }
                 },
                 "storage": {
-                    "amount": round(storage_cost, 2),
-                    "percentage": round((storage_cost / total_cost) * 100, 1) if total_cost > 0 else 0,
+                    "amount": rounded_amounts[1],
+                    "percentage": percentages[1],
                     "details": {
                         "days": storage_days,
                         "rate_per_mt_per_day": 25
                     }
                 },
                 "handling_packaging": {
-                    "amount": round(handling_cost + packaging_cost, 2),
-                    "percentage": round(((handling_cost + packaging_cost) / total_cost) * 100, 1),
+                    "amount": rounded_amounts[2],
+                    "percentage": percentages[2],
                     "details": {
                         "handling": round(handling_cost, 2),
                         "packaging": round(packaging_cost, 2)
                     }
                 },
                 "insurance_misc": {
-                    "amount": round(insurance_cost + misc_cost, 2),
-                    "percentage": round(((insurance_cost + misc_cost) / total_cost) * 100, 1),
+                    "amount": rounded_amounts[3],
+                    "percentage": percentages[3],
                     "details": {
                         "insurance": round(insurance_cost, 2),
                         "miscellaneous": round(misc_cost, 2)
@@ -481,14 +921,14 @@ class LIAAgent:
                     "distance_km": distance,
                     "include_storage": include_storage,
                     "cost_summary": {
-                        "total_cost_inr": round(total_cost, 2),
-                        "cost_per_mt": round(cost_per_unit, 2),
-                        "cost_per_km": round(total_cost / distance, 2) if distance > 0 else 0
+                        "total_cost_inr": _r2(total_cost),
+                        "cost_per_mt": _r2(cost_per_unit),
+                        "cost_per_km": _r2(total_cost / distance) if distance > 0 else 0
                     },
                     "cost_breakdown": cost_breakdown,
                     "optimization_suggestions": optimization_suggestions,
                     "comparison": {
-                        "industry_average_cost_per_mt": round(cost_per_unit * random.uniform(1.1, 1.3), 2),
+                        "industry_average_cost_per_mt": round(cost_per_unit * self._rng.uniform(1.1, 1.3), 2),
                         "your_efficiency": "Above Average" if cost_per_unit < 2000 else "Average"
                     }
                 },
@@ -530,14 +970,6 @@ class LIAAgent:
             # Generate risk assessment
             risk_assessment = self._generate_logistics_risk_assessment(produce_types, season)
             
-            # Create KPI targets
-            kpi_targets = {
-                "loss_reduction_target": "15%",
-                "cost_optimization_target": "10%",
-                "delivery_time_improvement": "20%",
-                "storage_utilization_target": "85%"
-            }
-            
             response = {
                 "success": True,
                 "data": {
@@ -559,13 +991,8 @@ class LIAAgent:
                         }
                     },
                     "risk_assessment": risk_assessment,
-                    "kpi_targets": kpi_targets,
-                    "success_factors": [
-                        "Proper timing of harvest and storage",
-                        "Efficient transportation coordination",
-                        "Quality maintenance throughout supply chain",
-                        "Cost optimization through collective planning"
-                    ]
+                    "kpi_targets": dict(_KPI_TARGETS),
+                    "success_factors": list(_SUCCESS_FACTORS)
                 },
                 "timestamp": datetime.now().isoformat(),
                 "message": self._translate_message("Comprehensive logistics plan created successfully", language)
@@ -585,69 +1012,34 @@ class LIAAgent:
     
     def _calculate_distance(self, origin: str, destination: str) -> float:
         """Calculate distance between two locations (mock implementation)"""
-        # Mock distance calculation based on location names
-        distances = {
-            ("bangalore", "kolar"): 65,
-            ("bangalore", "hassan"): 180,
-            ("kolar", "hassan"): 120,
-            ("bangalore", "mysore"): 150,
-            ("hassan", "mangalore"): 200
-        }
-        
-        key = (origin.lower(), destination.lower())
-        reverse_key = (destination.lower(), origin.lower())
-        
-        if key in distances:
-            return distances[key]
-        elif reverse_key in distances:
-            return distances[reverse_key]
-        else:
-            # Random distance for unknown routes
-            return random.uniform(50, 300)
+        # Canonical ordering collapses the forward/reverse lookups into one
+        # cached call
+        o = origin.lower()
+        d = destination.lower()
+        if o > d:
+            o, d = d, o
+        return _distance_cached(o, d)
     
     def _calculate_travel_time(self, distance: float, produce_type: str) -> float:
         """Calculate travel time considering produce requirements"""
-        base_speed = 45  # km/h
-        
-        # Adjust speed based on produce type
-        if produce_type.lower() in ["tomato", "grapes"]:
-            base_speed *= 0.8  # Slower for delicate produce
-        
-        return distance / base_speed
-    
+        # Slower for delicate produce
+        return _travel_time_kernel(distance, 45.0, _SPEED_MULT.get(produce_type.lower(), 1.0))
+
     def _calculate_transport_cost(self, distance: float, vehicle_specs: Dict, produce_type: str) -> float:
         """Calculate transportation cost"""
-        base_cost = distance * vehicle_specs["base_rate_per_km"]
-        loading_cost = vehicle_specs["loading_cost"]
-        
-        # Add premium for temperature-sensitive produce
-        if produce_type.lower() in ["tomato", "grapes", "apple"]:
-            base_cost *= 1.3  # 30% premium for refrigerated transport
-        
-        return base_cost + loading_cost
-    
+        # 30% premium for refrigerated transport of temperature-sensitive produce
+        return _transport_cost_kernel(
+            distance, vehicle_specs["base_rate_per_km"], vehicle_specs["loading_cost"],
+            _TRANSPORT_MULT.get(produce_type.lower(), 1.0)
+        )
+
     def _calculate_suitability_score(self, facility: ColdStorageFacility, produce_type: str,
                                    distance: float, capacity_needed: float) -> float:
         """Calculate facility suitability score"""
-        score = 0
-        
-        # Quality rating (40% weight)
-        score += (facility.quality_rating / 5.0) * 40
-        
-        # Distance factor (30% weight) - closer is better
-        distance_score = max(0, (300 - distance) / 300) * 30
-        score += distance_score
-        
-        # Capacity utilization (20% weight) - not too full, not too empty
-        utilization = capacity_needed / facility.available_capacity
-        capacity_score = max(0, (1 - abs(utilization - 0.5)) * 2) * 20
-        score += capacity_score
-        
-        # Cost factor (10% weight) - lower cost is better
-        cost_score = max(0, (50 - facility.cost_per_ton_per_day) / 50) * 10
-        score += cost_score
-        
-        return round(score, 1)
+        return round(_score_kernel(
+            facility.quality_rating, facility.cost_per_ton_per_day,
+            facility.available_capacity, distance, capacity_needed
+        ), 1)
     
     def _generate_storage_recommendations(self, facilities: List[Dict], produce_type: str,
                                         capacity: float, duration: int) -> List[str]:
@@ -674,219 +1066,211 @@ class LIAAgent:
     def _generate_route_optimization_tips(self, routes: List[Dict], produce_type: str,
                                         total_distance: float, total_time: float) -> List[str]:
         """Generate route optimization tips"""
-        tips = []
-        
-        if total_time > 8:
-            tips.append("Consider overnight stops to maintain driver alertness")
-        
-        if produce_type.lower() in ["tomato", "grapes"]:
-            tips.append("Use refrigerated transport to maintain quality")
-        
-        if total_distance > 200:
-            tips.append("Plan fuel stops and vehicle maintenance checks")
-        
-        tips.append("Load produce during cooler hours (early morning/evening)")
-        tips.append("Use GPS tracking for real-time monitoring")
-        
+        tips = [
+            tip
+            for cond, tip in (
+                (total_time > 8, "Consider overnight stops to maintain driver alertness"),
+                (produce_type.lower() in _DELICATE, "Use refrigerated transport to maintain quality"),
+                (total_distance > 200, "Plan fuel stops and vehicle maintenance checks"),
+            )
+            if cond
+        ]
+        tips += _STATIC_ROUTE_TIPS
         return tips
     
-    def _get_average_price(self, produce_type: str) -> float:
+    @staticmethod
+    def _get_average_price(produce_type: str) -> float:
         """Get average price for produce type"""
-        prices = {
-            "tomato": 1500, "onion": 2400, "potato": 1000,
-            "apple": 8000, "grapes": 6000, "rice": 3850
-        }
-        return prices.get(produce_type.lower(), 2000)
+        return _AVG_PRICES.get(produce_type.lower(), 2000)
     
-    def _get_prevention_measures(self, stage: str, cause: str, produce_type: str) -> List[str]:
+    @staticmethod
+    def _get_prevention_measures(stage: str, cause: str, produce_type: str) -> List[str]:
         """Get loss prevention measures"""
-        base_measures = self.mock_data["loss_prevention_tips"].get(stage, [])
-        
-        specific_measures = []
-        if cause.lower() == "spoilage":
-            specific_measures = ["Improve temperature control", "Reduce humidity", "Better ventilation"]
-        elif cause.lower() == "damage":
-            specific_measures = ["Use proper packaging", "Gentle handling", "Avoid overloading"]
-        elif cause.lower() == "theft":
-            specific_measures = ["Improve security", "Install CCTV", "Better lighting"]
-        
-        return base_measures + specific_measures
+        # Fresh list per call so the cached tuple stays immutable
+        return list(_prevention_measures(stage, cause))
     
     def _analyze_loss_patterns(self, produce_type: str, stage: str, cause: str) -> Dict[str, Any]:
         """Analyze loss patterns and trends"""
         return {
             "common_causes_at_stage": [cause, "temperature_fluctuation", "poor_handling"],
             "seasonal_pattern": f"{produce_type} losses typically higher in summer months",
-            "industry_benchmark": f"Average {stage} loss: {random.randint(5, 15)}%",
+            "industry_benchmark": f"Average {stage} loss: {self._rng.randint(5, 15)}%",
             "improvement_potential": "High - with proper measures, losses can be reduced by 60-80%"
         }
     
-    def _get_industry_loss_benchmark(self, stage: str) -> float:
+    @staticmethod
+    def _get_industry_loss_benchmark(stage: str) -> float:
         """Get industry loss benchmarks by stage"""
-        benchmarks = {
-            "harvest": 8.5, "storage": 12.3, "transport": 6.7, "market": 4.2
-        }
-        return benchmarks.get(stage, 10.0)
+        return _STAGE_BENCHMARKS.get(stage, 10.0)
     
-    def _calculate_loss_percentage(self, quantity_lost: float, produce_type: str) -> float:
+    @staticmethod
+    def _calculate_loss_percentage(quantity_lost: float, produce_type: str) -> float:
         """Calculate loss percentage (mock calculation)"""
         # Assume total quantity based on produce type
-        total_quantities = {
-            "tomato": 1000, "onion": 1500, "potato": 2000, "apple": 500
-        }
-        total = total_quantities.get(produce_type.lower(), 1000)
+        i = _PRODUCE_INDEX.get(produce_type.lower())
+        total = _DEFAULT_TOTAL_QTY if i is None else float(_PRODUCE_TABLE["qty"][i])
         return round((quantity_lost / total) * 100, 1)
+
+    @staticmethod
+    def _batch_loss_percent(produce_types: List[str], losses: List[float]) -> np.ndarray:
+        """Loss percentages for many produce types in one vectorized gather."""
+        idx = np.fromiter(
+            (_PRODUCE_INDEX.get(p.lower(), -1) for p in produce_types),
+            dtype=np.int64, count=len(produce_types)
+        )
+        totals = np.where(idx >= 0, _PRODUCE_TABLE["qty"][idx], _DEFAULT_TOTAL_QTY)
+        return np.round(np.asarray(losses, dtype=np.float64) / totals * 100, 1)
     
     def _check_environmental_conditions(self, produce_type: str, temperature: float,
                                       humidity: float, stage: str) -> List[str]:
         """Check environmental conditions and generate alerts"""
         alerts = []
-        requirements = self.mock_data["produce_requirements"].get(produce_type, {})
-        
-        if "temp_range" in requirements:
-            temp_range = requirements["temp_range"]
-            min_temp, max_temp = map(float, temp_range.replace("°C", "").split("-"))
-            
-            if temperature < min_temp:
-                alerts.append(f"Temperature too low: {temperature}°C (min: {min_temp}°C)")
-            elif temperature > max_temp:
-                alerts.append(f"Temperature too high: {temperature}°C (max: {max_temp}°C)")
-        
-        if "humidity" in requirements:
-            humidity_range = requirements["humidity"]
-            min_hum, max_hum = map(float, humidity_range.replace("%", "").split("-"))
-            
-            if humidity < min_hum:
-                alerts.append(f"Humidity too low: {humidity}% (min: {min_hum}%)")
-            elif humidity > max_hum:
-                alerts.append(f"Humidity too high: {humidity}% (max: {max_hum}%)")
-        
+        parsed = _PARSED_REQUIREMENTS.get(produce_type)
+        if parsed is None:
+            return alerts
+        min_temp, max_temp, min_hum, max_hum = parsed
+
+        if temperature < min_temp:
+            alerts.append(f"Temperature too low: {temperature}°C (min: {min_temp}°C)")
+        elif temperature > max_temp:
+            alerts.append(f"Temperature too high: {temperature}°C (max: {max_temp}°C)")
+
+        if humidity < min_hum:
+            alerts.append(f"Humidity too low: {humidity}% (min: {min_hum}%)")
+        elif humidity > max_hum:
+            alerts.append(f"Humidity too high: {humidity}% (max: {max_hum}%)")
+
         return alerts
+
+    @staticmethod
+    def _check_environmental_conditions_batch(produce_type: str, temperatures: Any,
+                                              humidities: Any) -> np.ndarray:
+        """Check many batches at once, returning an alert-flag array.
+
+        Flags follow _check_env_batch: bit 0 temp low, 1 temp high,
+        2 humidity low, 3 humidity high; all zero means in range.
+        """
+        temps = np.asarray(temperatures, dtype=np.float64)
+        hums = np.asarray(humidities, dtype=np.float64)
+        parsed = _PARSED_REQUIREMENTS.get(produce_type)
+        if parsed is None:
+            return np.zeros(temps.shape[0], dtype=np.uint8)
+        return _check_env_batch(temps, hums, *parsed)
     
-    def _get_stage_location(self, stage: str) -> str:
+    @staticmethod
+    def _get_stage_location(stage: str) -> str:
         """Get location based on supply chain stage"""
-        locations = {
-            "harvest": "Farm", "storage": "Cold Storage Facility",
-            "transport": "In Transit", "market": "Market/Distribution Center"
-        }
-        return locations.get(stage, "Unknown Location")
+        return _STAGE_LOCATIONS.get(stage, "Unknown Location")
     
     def _calculate_estimated_arrival(self, current_stage: str) -> str:
         """Calculate estimated arrival time"""
         if current_stage == "transport":
-            arrival_time = datetime.now() + timedelta(hours=random.randint(2, 12))
+            arrival_time = datetime.now() + timedelta(hours=self._rng.randint(2, 12))
         else:
-            arrival_time = datetime.now() + timedelta(days=random.randint(1, 5))
+            arrival_time = datetime.now() + timedelta(days=self._rng.randint(1, 5))
         
         return arrival_time.strftime("%Y-%m-%d %H:%M")
     
     def _assess_temperature(self, temperature: float, produce_type: str) -> str:
         """Assess temperature status"""
-        requirements = self.mock_data["produce_requirements"].get(produce_type, {})
-        if "temp_range" in requirements:
-            temp_range = requirements["temp_range"]
-            min_temp, max_temp = map(float, temp_range.replace("°C", "").split("-"))
-            
-            if min_temp <= temperature <= max_temp:
-                return "Optimal"
-            elif abs(temperature - (min_temp + max_temp) / 2) <= 2:
-                return "Acceptable"
-            else:
-                return "Critical"
-        return "Unknown"
-    
+        parsed = _PARSED_REQUIREMENTS.get(produce_type)
+        if parsed is None:
+            return "Unknown"
+        min_temp, max_temp = parsed[0], parsed[1]
+
+        # Straight-line computed index into the status tuple instead of
+        # an if/elif ladder
+        in_range = min_temp <= temperature <= max_temp
+        near = abs(temperature - (min_temp + max_temp) * 0.5) <= 2
+        return _STATUSES[0 if in_range else (1 if near else 2)]
+
     def _assess_humidity(self, humidity: float, produce_type: str) -> str:
         """Assess humidity status"""
-        requirements = self.mock_data["produce_requirements"].get(produce_type, {})
-        if "humidity" in requirements:
-            humidity_range = requirements["humidity"]
-            min_hum, max_hum = map(float, humidity_range.replace("%", "").split("-"))
-            
-            if min_hum <= humidity <= max_hum:
-                return "Optimal"
-            elif abs(humidity - (min_hum + max_hum) / 2) <= 5:
-                return "Acceptable"
-            else:
-                return "Critical"
-        return "Unknown"
+        parsed = _PARSED_REQUIREMENTS.get(produce_type)
+        if parsed is None:
+            return "Unknown"
+        min_hum, max_hum = parsed[2], parsed[3]
+
+        in_range = min_hum <= humidity <= max_hum
+        near = abs(humidity - (min_hum + max_hum) * 0.5) <= 5
+        return _STATUSES[0 if in_range else (1 if near else 2)]
     
     def _generate_monitoring_recommendations(self, status: SupplyChainStatus, alerts: List[str]) -> List[str]:
         """Generate monitoring recommendations"""
-        recommendations = []
-        
         if alerts:
-            recommendations.append("Immediate attention required - environmental conditions not optimal")
-            recommendations.append("Contact facility manager to adjust temperature/humidity")
+            recommendations = [
+                "Immediate attention required - environmental conditions not optimal",
+                "Contact facility manager to adjust temperature/humidity"
+            ]
         else:
-            recommendations.append("Conditions are optimal - continue monitoring")
-        
+            recommendations = ["Conditions are optimal - continue monitoring"]
+
         if status.quality_score < 0.8:
             recommendations.append("Quality degradation detected - consider expedited delivery")
-        
+
         recommendations.append("Schedule next quality check within 4 hours")
-        
         return recommendations
     
-    def _get_next_checkpoint(self, current_stage: str) -> str:
+    @staticmethod
+    def _get_next_checkpoint(current_stage: str) -> str:
         """Get next checkpoint in supply chain"""
-        checkpoints = {
-            "harvest": "Storage Facility",
-            "storage": "Loading for Transport",
-            "transport": "Destination Market",
-            "market": "Final Delivery"
-        }
-        return checkpoints.get(current_stage, "Unknown")
+        return _NEXT_CHECKPOINTS.get(current_stage, "Unknown")
     
-    def _generate_tracking_history(self, batch_id: str) -> List[Dict[str, Any]]:
-        """Generate mock tracking history"""
-        history = []
-        stages = ["harvest", "storage", "transport"]
-        
-        for i, stage in enumerate(stages):
-            timestamp = datetime.now() - timedelta(hours=(len(stages) - i) * 6)
-            history.append({
+    def _generate_tracking_history(self, batch_id: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Generate mock tracking history, materializing at most `limit` entries"""
+        now = datetime.now()
+        stages = ("harvest", "storage", "transport")
+        last = len(stages) - 1
+
+        entries = (
+            {
                 "stage": stage,
-                "timestamp": timestamp.strftime("%Y-%m-%d %H:%M"),
+                "timestamp": (now - (len(stages) - i) * _SIX_HOURS).strftime("%Y-%m-%d %H:%M"),
                 "location": self._get_stage_location(stage),
-                "status": "Completed" if i < len(stages) - 1 else "In Progress"
-            })
-        
-        return history
+                "status": "Completed" if i < last else "In Progress"
+            }
+            for i, stage in enumerate(stages)
+        )
+        return list(islice(entries, limit))
     
     def _generate_cost_optimization_suggestions(self, transport_cost: float, storage_cost: float,
                                               distance: float, quantity: float) -> List[str]:
         """Generate cost optimization suggestions"""
-        suggestions = []
-        
-        if transport_cost > storage_cost * 2:
-            suggestions.append("Transportation is major cost driver - consider consolidating shipments")
-        
-        if distance > 200:
-            suggestions.append("Long distance transport - explore rail or multi-modal options")
-        
-        if quantity < 5:
-            suggestions.append("Small quantity - consider grouping with other farmers for better rates")
-        
-        suggestions.append("Negotiate bulk rates for regular shipments")
-        suggestions.append("Consider seasonal pricing for storage facilities")
-        
+        suggestions = [
+            tip
+            for cond, tip in (
+                (transport_cost > storage_cost * 2, "Transportation is major cost driver - consider consolidating shipments"),
+                (distance > 200, "Long distance transport - explore rail or multi-modal options"),
+                (quantity < 5, "Small quantity - consider grouping with other farmers for better rates"),
+            )
+            if cond
+        ]
+        suggestions += _STATIC_COST_SUGGESTIONS
         return suggestions
     
     def _generate_logistics_timeline(self, produce_types: List[str], season: str, horizon: int) -> List[Dict[str, Any]]:
-        """Generate logistics timeline"""
+        """Generate logistics timeline capped to the planning horizon"""
         timeline = []
-        
-        for i, produce in enumerate(produce_types):
-            harvest_date = datetime.now() + timedelta(days=i * 15)
-            storage_date = harvest_date + timedelta(days=1)
-            transport_date = storage_date + timedelta(days=random.randint(7, 30))
+
+        # Harvest windows land every 15 days, so entries past the horizon
+        # are dropped upfront rather than generated and filtered
+        max_entries = max(1, horizon // 15 + 1)
+        now = datetime.now()
+
+        # One batched draw covers every entry's storage dwell time
+        dwell_days = _RNG.integers(7, 31, size=min(len(produce_types), max_entries))
+
+        for i, produce in islice(enumerate(produce_types), max_entries):
+            harvest_date = now + i * _FIFTEEN_DAYS
+            storage_date = harvest_date + _ONE_DAY
+            transport_date = storage_date + int(dwell_days[i]) * _ONE_DAY
             
             timeline.append({
                 "produce": produce,
                 "harvest_window": harvest_date.strftime("%Y-%m-%d"),
                 "storage_start": storage_date.strftime("%Y-%m-%d"),
                 "transport_schedule": transport_date.strftime("%Y-%m-%d"),
-                "market_arrival": (transport_date + timedelta(days=1)).strftime("%Y-%m-%d")
+                "market_arrival": (transport_date + _ONE_DAY).strftime("%Y-%m-%d")
             })
         
         return timeline
@@ -894,9 +1278,9 @@ class LIAAgent:
     def _calculate_resource_requirements(self, produce_types: List[str], season: str) -> Dict[str, Any]:
         """Calculate resource requirements"""
         return {
-            "storage_capacity_mt": len(produce_types) * random.randint(50, 200),
+            "storage_capacity_mt": len(produce_types) * self._rng.randint(50, 200),
             "transport_vehicles": math.ceil(len(produce_types) / 2),
-            "cold_storage_days": random.randint(15, 45),
+            "cold_storage_days": self._rng.randint(15, 45),
             "handling_workforce": len(produce_types) * 3,
             "packaging_materials": f"{len(produce_types) * 1000} units"
         }
@@ -905,36 +1289,39 @@ class LIAAgent:
         """Generate storage allocation plan"""
         facilities = self.mock_data["cold_storage_facilities"]
         
+        capacities = _RNG.integers(20, 101, size=len(produce_types))
+
         allocation = {}
         for i, produce in enumerate(produce_types):
             facility = facilities[i % len(facilities)]
             allocation[produce] = {
                 "facility": facility.name,
                 "location": facility.location,
-                "allocated_capacity": random.randint(20, 100),
+                "allocated_capacity": int(capacities[i]),
                 "cost_per_day": facility.cost_per_ton_per_day
             }
-        
+
         return allocation
     
     def _generate_transport_schedule(self, produce_types: List[str], season: str) -> List[Dict[str, Any]]:
         """Generate transport schedule"""
+        durations = _RNG.integers(4, 13, size=len(produce_types))
+
         schedule = []
-        
-        for produce in produce_types:
+        for i, produce in enumerate(produce_types):
             schedule.append({
                 "produce": produce,
                 "vehicle_type": "refrigerated_truck",
                 "departure_time": "06:00 AM",  # Early morning for freshness
-                "estimated_duration": f"{random.randint(4, 12)} hours",
-                "route_priority": "high" if produce in ["tomato", "grapes"] else "medium"
+                "estimated_duration": f"{durations[i]} hours",
+                "route_priority": "high" if produce in _DELICATE else "medium"
             })
-        
+
         return schedule
     
     def _calculate_logistics_budget(self, produce_types: List[str], resources: Dict[str, Any]) -> float:
         """Calculate total logistics budget"""
-        base_cost_per_produce = random.randint(50000, 150000)
+        base_cost_per_produce = self._rng.randint(50000, 150000)
         return len(produce_types) * base_cost_per_produce
     
     def _generate_logistics_risk_assessment(self, produce_types: List[str], season: str) -> Dict[str, Any]:
@@ -954,82 +1341,62 @@ class LIAAgent:
     
     def _translate_message(self, message: str, language: str) -> str:
         """Translate messages to specified language"""
-        if language == "hi":
-            translations = {
-                "Cold storage facilities found successfully": "कोल्ड स्टोरेज सुविधाएं सफलतापूर्वक मिलीं",
-                "Failed to find cold storage facilities": "कोल्ड स्टोरेज सुविधाएं खोजने में विफल",
-                "Route optimization completed successfully": "रूट अनुकूलन सफलतापूर्वक पूर्ण",
-                "Failed to optimize transportation route": "परिवहन मार्ग अनुकूलन में विफल",
-                "Loss tracking and analysis completed": "नुकसान ट्रैकिंग और विश्लेषण पूर्ण",
-                "Failed to track and analyze loss": "नुकसान ट्रैकिंग और विश्लेषण में विफल",
-                "Supply chain monitoring completed": "आपूर्ति श्रृंखला निगरानी पूर्ण",
-                "Failed to monitor supply chain": "आपूर्ति श्रृंखला निगरानी में विफल",
-                "Logistics cost calculation completed": "लॉजिस्टिक्स लागत गणना पूर्ण",
-                "Failed to calculate logistics costs": "लॉजिस्टिक्स लागत गणना में विफल",
-                "Comprehensive logistics plan created successfully": "व्यापक लॉजिस्टिक्स योजना सफलतापूर्वक बनाई गई",
-                "Failed to create logistics plan": "लॉजिस्टिक्स योजना बनाने में विफल"
-            }
-            return translations.get(message, message)
-        elif language == "kn":
-            translations = {
-                "Cold storage facilities found successfully": "ಕೋಲ್ಡ್ ಸ್ಟೋರೇಜ್ ಸೌಲಭ್ಯಗಳು ಯಶಸ್ವಿಯಾಗಿ ಕಂಡುಬಂದಿವೆ",
-                "Failed to find cold storage facilities": "ಕೋಲ್ಡ್ ಸ್ಟೋರೇಜ್ ಸೌಲಭ್ಯಗಳನ್ನು ಹುಡುಕುವಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
-                "Route optimization completed successfully": "ಮಾರ್ಗ ಅನುಕೂಲೀಕರಣ ಯಶಸ್ವಿಯಾಗಿ ಪೂರ್ಣಗೊಂಡಿದೆ",
-                "Failed to optimize transportation route": "ಸಾರಿಗೆ ಮಾರ್ಗ ಅನುಕೂಲೀಕರಣದಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
-                "Loss tracking and analysis completed": "ನಷ್ಟ ಟ್ರ್ಯಾಕಿಂಗ್ ಮತ್ತು ವಿಶ್ಲೇಷಣೆ ಪೂರ್ಣಗೊಂಡಿದೆ",
-                "Failed to track and analyze loss": "ನಷ್ಟ ಟ್ರ್ಯಾಕಿಂಗ್ ಮತ್ತು ವಿಶ್ಲೇಷಣೆಯಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
-                "Supply chain monitoring completed": "ಪೂರೈಕೆ ಸರಪಳಿ ಮೇಲ್ವಿಚಾರಣೆ ಪೂರ್ಣಗೊಂಡಿದೆ",
-                "Failed to monitor supply chain": "ಪೂರೈಕೆ ಸರಪಳಿ ಮೇಲ್ವಿಚಾರಣೆಯಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
-                "Logistics cost calculation completed": "ಲಾಜಿಸ್ಟಿಕ್ಸ್ ವೆಚ್ಚ ಲೆಕ್ಕಾಚಾರ ಪೂರ್ಣಗೊಂಡಿದೆ",
-                "Failed to calculate logistics costs": "ಲಾಜಿಸ್ಟಿಕ್ಸ್ ವೆಚ್ಚ ಲೆಕ್ಕಾಚಾರದಲ್ಲಿ ವಿಫಲವಾಗಿದೆ",
-                "Comprehensive logistics plan created successfully": "ಸಮಗ್ರ ಲಾಜಿಸ್ಟಿಕ್ಸ್ ಯೋಜನೆಯನ್ನು ಯಶಸ್ವಿಯಾಗಿ ರಚಿಸಲಾಗಿದೆ",
-                "Failed to create logistics plan": "ಲಾಜಿಸ್ಟಿಕ್ಸ್ ಯೋಜನೆ ರಚಿಸುವಲ್ಲಿ ವಿಫಲವಾಗಿದೆ"
-            }
-            return translations.get(message, message)
-        return message
+        return _translate(message, language)
+
+# Shared agent behind the ADK tool functions, created lazily on first use:
+# the tool call path no longer pays a constructor per invocation
+_LIA_AGENT: Optional[LIAAgent] = None
+
+
+def _get_agent() -> LIAAgent:
+    global _LIA_AGENT
+    if _LIA_AGENT is None:
+        _LIA_AGENT = LIAAgent()
+    return _LIA_AGENT
+
 
 # Google ADK tool functions
 def cold_storage_finder(produce_type: str, location: str, capacity_needed: float,
                        duration: int = 30, language: str = "en") -> str:
     """Tool function for finding cold storage facilities"""
-    agent = LIAAgent()
+    agent = _get_agent()
     result = agent.cold_storage_finder(produce_type, location, capacity_needed, duration, language)
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 def route_optimizer(origin: str, destinations: List[str], produce_type: str,
                    vehicle_type: str = "truck", language: str = "en") -> str:
     """Tool function for route optimization"""
-    agent = LIAAgent()
+    agent = _get_agent()
     result = agent.route_optimizer(origin, destinations, produce_type, vehicle_type, language)
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 def loss_tracker(produce_type: str, loss_stage: str, quantity_lost: float,
                 loss_cause: str, language: str = "en") -> str:
     """Tool function for loss tracking"""
-    agent = LIAAgent()
+    agent = _get_agent()
     result = agent.loss_tracker(produce_type, loss_stage, quantity_lost, loss_cause, language)
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 def supply_chain_monitor(batch_id: str, current_stage: str,
                         check_conditions: bool = True, language: str = "en") -> str:
     """Tool function for supply chain monitoring"""
-    agent = LIAAgent()
+    agent = _get_agent()
     result = agent.supply_chain_monitor(batch_id, current_stage, check_conditions, language)
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 def cost_calculator(produce_type: str, quantity: float, origin: str,
                    destination: str, include_storage: bool = False, language: str = "en") -> str:
     """Tool function for cost calculation"""
-    agent = LIAAgent()
+    agent = _get_agent()
     result = agent.cost_calculator(produce_type, quantity, origin, destination, include_storage, language)
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 def logistics_planner(fpo_id: str, produce_types: List[str], season: str,
                      planning_horizon: int = 90, language: str = "en") -> str:
     """Tool function for logistics planning"""
-    agent = LIAAgent()
+    agent = _get_agent()
     result = agent.logistics_planner(fpo_id, produce_types, season, planning_horizon, language)
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 if __name__ == "__main__":
     # Test the agent